@@ -1,8 +1,58 @@
-
-from .unicode_charset import Unicode
-from .utf8 import UTF8
-from .gb18030 import GB18030
-from .gbk import GBK
-from .gb2312 import GB2312
+from collections import OrderedDict
+from collections.abc import Mapping
+from importlib import import_module
 
 version = '0.1.5'
+
+
+class CharsetRegistry(Mapping):
+    # charset name -> class, a charset module is imported when its class is
+    # first asked for
+    def __init__(self, modules):
+        self.modules = OrderedDict(modules)
+
+    def __getitem__(self, name):
+        module, cls = self.modules[name]
+        return getattr(import_module(module, __name__), cls)
+
+    def __iter__(self):
+        return iter(self.modules)
+
+    def __len__(self):
+        return len(self.modules)
+
+    def class_names(self):
+        return [cls for module, cls in self.modules.values()]
+
+
+CHARSET_CLASS = CharsetRegistry((
+    ('gb2312', ('.gb2312', 'GB2312')),
+    ('gbk', ('.gbk', 'GBK')),
+    ('gb18030', ('.gb18030', 'GB18030')),
+    ('utf8', ('.utf8', 'UTF8')),
+    ('unicode', ('.unicode_charset', 'Unicode')),
+))
+
+# other names imported on first use
+LAZY_NAMES = {
+    'detect': ('.detector', 'detect'),
+    'AsyncCharset': ('.aio', 'AsyncCharset'),
+}
+
+__all__ = ['version', 'CHARSET_CLASS'] + CHARSET_CLASS.class_names() + list(LAZY_NAMES)
+
+
+def __getattr__(name):
+    for key, (module, cls) in CHARSET_CLASS.modules.items():
+        if cls == name:
+            value = globals()[name] = CHARSET_CLASS[key]
+            return value
+    if name in LAZY_NAMES:
+        module, attr = LAZY_NAMES[name]
+        value = globals()[name] = getattr(import_module(module, __name__), attr)
+        return value
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
+
+
+def __dir__():
+    return sorted(list(globals().keys()) + CHARSET_CLASS.class_names() + list(LAZY_NAMES))
@@ -1,25 +1,341 @@
 #!/usr/bin/env python
 # -*- encoding:utf-8 -*-
 
+import io
+import os
 import sys
 import argparse
 from collections import OrderedDict
 
-from charset import version, Unicode, UTF8, GB18030, GBK, GB2312
+from charset import version, CHARSET_CLASS
+from charset.cache import TableCache, default_cache_dir
+from charset.utils import open_output, compressed_text
 
 
-CHARSET_CLASS = OrderedDict((
-    ('gb2312', GB2312),
-    ('gbk', GBK),
-    ('gb18030', GB18030),
-    ('utf8', UTF8),
-    ('unicode', Unicode),
+def annotate_main(argv):
+    from charset.annotate import annotate, FORMATS
+
+    parser = argparse.ArgumentParser(
+        prog='charset annotate',
+        description='Output code and category of every character in file.',
+    )
+    parser.add_argument(
+        '--encoding',
+        choices=CHARSET_CLASS.keys(),
+        required=True,
+        help='Use charset',
+    )
+    parser.add_argument(
+        '--file-encoding',
+        help='encoding of file. default: encoding of charset'
+    )
+    parser.add_argument(
+        '--format',
+        choices=FORMATS.keys(),
+        default='tsv',
+        help='output format. default: tsv'
+    )
+    parser.add_argument(
+        'file',
+        help='input file, "-" for stdin'
+    )
+    parser.add_argument(
+        'output',
+        nargs='?',
+        help='output file'
+    )
+    args = parser.parse_args(argv)
+
+    charset = CHARSET_CLASS[args.encoding]()
+    fmt = FORMATS[args.format]
+    if args.file == '-':
+        fin = getattr(sys.stdin, 'buffer', sys.stdin)
+    else:
+        fin = open(args.file, 'rb')
+    if args.output:
+        fout = io.open(args.output, 'w', encoding='utf-8')
+    else:
+        fout = sys.stdout
+    try:
+        for item in annotate(charset, fin, encoding=args.file_encoding):
+            fout.write(fmt(item))
+            fout.write('\n')
+    finally:
+        if args.file != '-':
+            fin.close()
+        if args.output:
+            fout.close()
+
+
+def serve_main(argv):
+    from charset.server import CharsetServer
+
+    parser = argparse.ArgumentParser(
+        prog='charset serve',
+        description='Serve code, char and category lookups and panel pages over HTTP.',
+    )
+    parser.add_argument(
+        '--host',
+        default='127.0.0.1',
+        help='listen address. default: 127.0.0.1'
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=8000,
+        help='listen port. default: 8000'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        help='code table cache directory. default: %s' % default_cache_dir()
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='do not use code table cache'
+    )
+    parser.add_argument(
+        '--quiet',
+        action='store_true',
+        help='do not log requests'
+    )
+    args = parser.parse_args(argv)
+
+    cache = None
+    if not args.no_cache:
+        cache = TableCache(args.cache_dir)
+    server = CharsetServer((args.host, args.port), cache=cache, quiet=args.quiet)
+    print('Serving on http://%s:%s/' % server.server_address[:2])
+    sys.stdout.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def coverage_main(argv):
+    from charset.coverage import coverage, format_coverage
+
+    parser = argparse.ArgumentParser(
+        prog='charset coverage',
+        description='Count characters of files per charset and category.',
+    )
+    parser.add_argument(
+        '--encoding',
+        action='append',
+        choices=CHARSET_CLASS.keys(),
+        help='count for charset, may be repeated. default: all'
+    )
+    parser.add_argument(
+        '--file-encoding',
+        default='utf-8',
+        help='encoding of files. default: utf-8'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        help='read files with N processes'
+    )
+    parser.add_argument(
+        '--top',
+        type=int,
+        default=10,
+        help='list N most frequent missing characters. default: 10'
+    )
+    parser.add_argument(
+        '--json',
+        help='write result to JSON file'
+    )
+    parser.add_argument(
+        'files',
+        nargs='+',
+        help='input files, "-" for stdin'
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        result = coverage(
+            args.files,
+            encodings=args.encoding,
+            file_encoding=args.file_encoding,
+            jobs=args.jobs,
+        )
+    except OSError as err:
+        parser.error('cannot read %s: %s' % (err.filename, err.strerror))
+    print(format_coverage(result, top=args.top))
+    if args.json:
+        import json
+        with io.open(args.json, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+def detect_main(argv):
+    from charset.detector import detect, DETECT_ENCODINGS
+
+    parser = argparse.ArgumentParser(
+        prog='charset detect',
+        description='Detect encoding of files.',
+    )
+    parser.add_argument(
+        '--encoding',
+        action='append',
+        choices=DETECT_ENCODINGS,
+        help='candidate charset, may be repeated. default: all'
+    )
+    parser.add_argument(
+        'files',
+        nargs='+',
+        help='input files, "-" for stdin'
+    )
+    args = parser.parse_args(argv)
+
+    for path in args.files:
+        if path == '-':
+            result = detect(getattr(sys.stdin, 'buffer', sys.stdin), args.encoding)
+        else:
+            with open(path, 'rb') as f:
+                result = detect(f, args.encoding)
+        print('%s: %s (%.4f)' % (path, result['encoding'], result['confidence']))
+
+
+def validate_main(argv):
+    from charset.validate import validate, CHUNK_SIZE
+
+    parser = argparse.ArgumentParser(
+        prog='charset validate',
+        description='Find invalid byte sequences of a file and count characters per category.',
+    )
+    parser.add_argument(
+        '--encoding',
+        required=True,
+        choices=CHARSET_CLASS.keys(),
+        help='charset of file'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        help='scan chunks of file with N processes'
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=CHUNK_SIZE,
+        help='bytes of a chunk. default: %s' % CHUNK_SIZE
+    )
+    parser.add_argument(
+        '--max-errors',
+        type=int,
+        default=100,
+        help='list N invalid sequences at most. default: 100'
+    )
+    parser.add_argument(
+        'file',
+        help='input file'
+    )
+    args = parser.parse_args(argv)
+
+    result = validate(
+        args.file,
+        args.encoding,
+        jobs=args.jobs,
+        chunk_size=args.chunk_size,
+        max_errors=args.max_errors,
+    )
+    for offset, seq in result['errors']:
+        print('0x%08x: invalid sequence %s' % (offset, seq.hex()))
+    print('Size: %s, chunks: %s, chars: %s, invalid: %s' % (
+        result['size'], result['chunks'], result['chars'], result['invalid']))
+    for category, count in result['categories'].items():
+        print('  %-36s %10d' % (category, count))
+    if result['invalid']:
+        sys.exit(1)
+
+
+def build_main(argv):
+    from charset.build import build
+
+    parser = argparse.ArgumentParser(
+        prog='charset build',
+        description='Render the HTML targets of a manifest whose inputs changed.',
+        epilog='Manifest lines are "encoding panels output", e.g. "gbk 0,1 gbk.html".',
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        help='render targets with N processes'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='render all targets'
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='list targets to render, render nothing'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        help='code table cache directory. default: %s' % default_cache_dir()
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='do not use code table cache'
+    )
+    parser.add_argument(
+        'manifest',
+        help='manifest file'
+    )
+    args = parser.parse_args(argv)
+
+    cache = None
+    if not args.no_cache:
+        cache = TableCache(args.cache_dir)
+    try:
+        result = build(
+            args.manifest, jobs=args.jobs, force=args.force, dry_run=args.dry_run, cache=cache)
+    except ValueError as err:
+        parser.error(str(err))
+    for output, action in result.items():
+        print('%-5s %s' % (action, os.path.relpath(output)))
+    print('%s built, %s up to date' % (
+        list(result.values()).count('build'), list(result.values()).count('skip')))
+
+
+def write_arrays(path, charset, panels):
+    # columns of all panels joined, with the panel of each code
+    import numpy as np
+    parts = [charset.to_arrays(p) for p in panels]
+    columns = OrderedDict()
+    for key in ('code', 'point', 'category', 'valid'):
+        columns[key] = np.concatenate([part[key] for part in parts])
+    columns['panel'] = np.concatenate([
+        np.full(len(part['code']), int(p), np.uint8) for p, part in zip(panels, parts)])
+    # names grow with the panels, the last one holds them all
+    columns['names'] = parts[-1]['names']
+    np.savez_compressed(path, **columns)
+
+
+COMMANDS = OrderedDict((
+    ('annotate', annotate_main),
+    ('serve', serve_main),
+    ('coverage', coverage_main),
+    ('detect', detect_main),
+    ('validate', validate_main),
+    ('build', build_main),
 ))
 
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        return COMMANDS[sys.argv[1]](sys.argv[2:])
+
     parser = argparse.ArgumentParser(
-        epilog='System encoding: %s' % sys.getfilesystemencoding(),
+        epilog='Commands: %s. System encoding: %s' % (
+            ', '.join(COMMANDS.keys()), sys.getfilesystemencoding()),
     )
     parser.add_argument(
         '--version',
@@ -29,13 +345,47 @@ def main():
     parser.add_argument(
         '--encoding',
         choices=CHARSET_CLASS.keys(),
-        required=True,
         help='Use charset',
     )
+    parser.add_argument(
+        '--all',
+        action='store_true',
+        help='output code of every charset with --code'
+    )
     parser.add_argument(
         '--panel',
         help='output charset panel'
     )
+    parser.add_argument(
+        '--page',
+        type=int,
+        help='output only page N of panel'
+    )
+    parser.add_argument(
+        '--pages',
+        metavar='DIR',
+        help='output pages of panels and index.html to directory'
+    )
+    parser.add_argument(
+        '--arrays',
+        metavar='FILE',
+        help='output code, code point, category and valid columns of panels to .npz file'
+    )
+    parser.add_argument(
+        '--compress',
+        choices=['gzip', 'zlib', 'xz'],
+        help='compress HTML output while it is written. default: by suffix of output file, .gz .zz .xz'
+    )
+    parser.add_argument(
+        '--collapse',
+        action='store_true',
+        help='leave out rows and tables without a valid code'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        help='render panels with N processes'
+    )
     parser.add_argument(
         '-P',
         action='store_true',
@@ -51,6 +401,20 @@ def main():
         action='store_true',
         help='output Unicode code for character'
     )
+    parser.add_argument(
+        '--cache-dir',
+        help='code table cache directory. default: %s' % default_cache_dir()
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='do not use code table cache'
+    )
+    parser.add_argument(
+        '--rebuild-cache',
+        action='store_true',
+        help='rebuild code table cache'
+    )
     parser.add_argument(
         'target',
         nargs='?',
@@ -59,25 +423,66 @@ def main():
 
     args = parser.parse_args()
 
-    in_encoding = out_encoding = sys.getfilesystemencoding()
+    in_encoding = sys.getfilesystemencoding()
 
-    charset = CHARSET_CLASS[args.encoding]()
+    if not args.encoding and not (args.all and args.code):
+        parser.error('the following arguments are required: --encoding')
+
+    cache = None
+    if not args.no_cache:
+        cache = TableCache(args.cache_dir, rebuild=args.rebuild_cache)
+
+    if args.all and args.code:
+        from charset.reverse import codes_of
+        chars = args.target
+        if isinstance(chars, bytes):
+            chars = chars.decode(in_encoding)
+        for name, codes in codes_of(chars, cache=cache).items():
+            print('%s code:' % name.upper())
+            print(','.join([code or '-' for code in codes]))
+        return
+    charset = CHARSET_CLASS[args.encoding](cache=cache)
 
     if args.P:
         for k, v in charset.define.items():
             p = k[5:]
             print('Panel %s: %s' % (p, ' - '.join(v['desc'])))
+    elif args.panel and args.arrays:
+        write_arrays(args.arrays, charset, args.panel.split(','))
+        print('Write arrays of panel %s to %s' % (args.panel, args.arrays))
+    elif args.panel and args.pages:
+        panels = args.panel.split(',')
+        filenames = charset.write_pages(
+            args.pages, panels=panels, jobs=args.jobs, collapse=args.collapse, compress=args.compress)
+        # index.html and the stylesheet are not pages
+        print('Write %s pages to %s' % (len(filenames) - 2, args.pages))
     elif args.panel:
-        html = charset.as_html(panels=args.panel.split(','))
+        panels = args.panel.split(',')
+        if args.page is not None:
+            try:
+                charset.check_page(panels, args.page)
+            except ValueError as err:
+                parser.error(str(err))
         if args.target:
-            with open(args.target, 'w') as f:
-                f.write(html.encode('utf-8'))
+            with open_output(args.target, args.compress) as f:
+                charset.write_html(
+                    f, panels=panels, jobs=args.jobs, page=args.page, collapse=args.collapse)
+        elif args.compress:
+            f = compressed_text(sys.stdout.buffer, args.compress)
+            charset.write_html(
+                f, panels=panels, jobs=args.jobs, page=args.page, collapse=args.collapse)
+            f.write('\n')
+            f.close()
         else:
-            print(html.encode(out_encoding))
+            charset.write_html(
+                sys.stdout, panels=panels, jobs=args.jobs, page=args.page, collapse=args.collapse)
+            sys.stdout.write('\n')
     elif args.code:
-        chars = args.target.decode(in_encoding)
+        chars = args.target
+        if isinstance(chars, bytes):
+            chars = chars.decode(in_encoding)
         print('%s code:' % args.encoding.upper())
-        print(','.join(charset.codes(chars)))
+        print(charset.codes_bulk(chars))
     elif args.char:
         if '-' in args.target:
             codes = args.target.split('-')
@@ -86,7 +491,7 @@ def main():
         else:
             codes = [args.target]
         print('%s char:' % args.encoding.upper())
-        print(''.join(charset.chars(codes)))
+        print(charset.chars_bulk(codes))
     else:
         parser.print_help()
 
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- encoding:utf-8 -*-
+
+import asyncio
+from collections import deque
+
+from charset import CHARSET_CLASS
+
+
+CHUNK_SIZE = 4096
+
+# charsets of this process, a worker of a process pool keeps its own
+CHARSETS = {}
+
+
+def get_charset(encoding, cache=None):
+    charset = CHARSETS.get(encoding)
+    if charset is None:
+        charset = CHARSETS[encoding] = CHARSET_CLASS[encoding](cache=cache)
+    return charset
+
+
+def lookup_chunk(encoding, cache, method, items):
+    charset = get_charset(encoding, cache)
+    if method == 'categories':
+        return [charset.char_category(ch) for ch in items]
+    return getattr(charset, method)(items)
+
+
+class AsyncCharset(object):
+    # codes, chars and categories of a charset for asyncio code. Items are
+    # looked up a chunk at a time on executor, at most max_pending chunks
+    # are submitted at once. When the awaiting task is cancelled, chunks
+    # not started yet are cancelled too. Without executor, a thread pool
+    # is made and shut down by close().
+    def __init__(self, encoding, executor=None, chunk_size=CHUNK_SIZE, max_pending=4, cache=None):
+        if encoding not in CHARSET_CLASS:
+            raise ValueError('unknown encoding: %s' % encoding)
+        self.encoding = encoding
+        self.executor = executor
+        self.own_executor = executor is None
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending
+        self.cache = cache
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.own_executor and self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    def get_executor(self):
+        if self.executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self.executor = ThreadPoolExecutor(self.max_pending)
+        return self.executor
+
+    async def run(self, method, items):
+        loop = asyncio.get_running_loop()
+        executor = self.get_executor()
+        items = list(items)
+        results = []
+        pending = deque()
+        try:
+            for start in range(0, len(items), self.chunk_size):
+                if len(pending) >= self.max_pending:
+                    results += await pending.popleft()
+                pending.append(loop.run_in_executor(
+                    executor, lookup_chunk, self.encoding, self.cache, method,
+                    items[start:start + self.chunk_size]))
+            while pending:
+                results += await pending.popleft()
+        finally:
+            for future in pending:
+                future.cancel()
+        return results
+
+    async def codes(self, chars):
+        return await self.run('codes', chars)
+
+    async def chars(self, codes):
+        return await self.run('chars', codes)
+
+    async def categories(self, chars):
+        # category of every character, like char_category
+        return await self.run('categories', chars)
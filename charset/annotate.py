@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- encoding:utf-8 -*-
+
+import codecs
+import json
+import struct
+
+
+CHUNK_SIZE = 1 << 16
+
+TSV_ESCAPE = {
+    ord('\\'): u'\\\\',
+    ord('\t'): u'\\t',
+    ord('\n'): u'\\n',
+    ord('\r'): u'\\r',
+}
+
+
+def iter_text(fileobj, encoding, errors='replace', chunk_size=CHUNK_SIZE):
+    # the incremental decoder keeps a multibyte sequence split by a read
+    # until the rest of it arrives
+    decoder = codecs.getincrementaldecoder(encoding)(errors=errors)
+    while True:
+        data = fileobj.read(chunk_size)
+        text = decoder.decode(data, final=not data)
+        if text:
+            yield text
+        if not data:
+            break
+
+
+def annotation(charset, ch):
+    try:
+        code = charset.codes([ch])[0]
+        category = charset.char_category(ch)
+    except (UnicodeEncodeError, struct.error):
+        return None, None
+    return code, category
+
+
+def annotate(charset, fileobj, encoding=None, errors='replace', chunk_size=CHUNK_SIZE):
+    # (offset, char, code, category) for each character of a binary file,
+    # offset counts characters. Every distinct character is looked up once.
+    known = {}
+    offset = 0
+    for text in iter_text(fileobj, encoding or charset.encoding, errors, chunk_size):
+        for ch in text:
+            item = known.get(ch)
+            if item is None:
+                item = known[ch] = annotation(charset, ch)
+            yield (offset, ch) + item
+            offset += 1
+
+
+def format_tsv(item):
+    offset, ch, code, category = item
+    return u'%s\t%s\t%s\t%s' % (offset, ch.translate(TSV_ESCAPE), code or '', category or '')
+
+
+def format_jsonl(item):
+    offset, ch, code, category = item
+    return json.dumps({
+        'offset': offset,
+        'char': ch,
+        'code': code,
+        'category': category,
+    }, ensure_ascii=False)
+
+
+FORMATS = {
+    'tsv': format_tsv,
+    'jsonl': format_jsonl,
+}
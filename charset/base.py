@@ -1,9 +1,42 @@
 #!/usr/bin/env python
 # -*- encoding:utf-8 -*-
 
+import os
 import struct
+from collections import OrderedDict, deque
 
-from .utils import get_colors
+from .utils import get_colors, open_output, COMPRESS_SUFFIX
+from .index import BoxIndex
+from .codetable import CodeTable
+
+
+def render_slice(cls, define, err_ch, collapse=False):
+    return list(cls().render_panel(define, err_ch, collapse))
+
+
+def write_page(cls, cache, path, panel, page, err_ch, collapse=False, stylesheet=None, compress=None):
+    charset = cls(cache=cache)
+    filename = os.path.join(path, charset.page_filename(panel, page))
+    if compress:
+        filename += COMPRESS_SUFFIX[compress]
+    with open_output(filename, compress) as f:
+        charset.write_html(
+            f, panels=[panel], errors=err_ch, page=page, collapse=collapse, stylesheet=stylesheet)
+    return filename
+
+
+class CellTags(dict):
+    # category name -> opening tag of a cell, names without a class id keep
+    # their name as class
+    def __missing__(self, name):
+        tag = self[name] = '<td class="%s">' % name
+        return tag
+
+
+def slice_lines(part):
+    if isinstance(part, list):
+        return part
+    return part.result()
 
 
 class CharsetBase(object):
@@ -12,6 +45,7 @@ class CharsetBase(object):
     detail = []
     wiki = ''
     encoding = 'ascii'
+    code_size = 4
     define = {
         'panel': {
             'desc': [],
@@ -19,95 +53,456 @@ class CharsetBase(object):
         },
     }
     category = {}
+    # stylesheet shared by the pages of write_pages
+    stylesheet = 'style.css'
 
-    def __init__(self, errors=None):
-        pass
+    def __init__(self, errors=None, cache=None):
+        self.cache = cache
+        self.tables = {}
 
     def __repr__(self):
         return '<%s>' % self.title
 
+    @classmethod
+    def category_index(cls):
+        index = cls.__dict__.get('_category_index')
+        if index is None:
+            index = cls.build_category_index()
+            cls._category_index = index
+        return index
+
+    @classmethod
+    def build_category_index(cls):
+        return BoxIndex(cls.category)
+
     def get_category(self, b_code):
-        return None
+        return self.category_index().lookup(b_code)
+
+    @classmethod
+    def class_ids(cls):
+        # category name -> short class name used in the HTML, numbered over
+        # all panels so that pages of any panels can share one stylesheet
+        ids = cls.__dict__.get('_class_ids')
+        if ids is None:
+            ids = {}
+            for key in sorted(cls.category, key=lambda x: int(x[5:] or 0)):
+                for c in cls.category[key]:
+                    ids.setdefault(c['name'], 'c%x' % len(ids))
+            cls._class_ids = ids
+        return ids
+
+    @classmethod
+    def cell_tags(cls):
+        tags = cls.__dict__.get('_cell_tags')
+        if tags is None:
+            tags = CellTags((name, '<td class="%s">' % x) for name, x in cls.class_ids().items())
+            tags[None] = tags[''] = '<td>'
+            cls._cell_tags = tags
+        return tags
+
+    def char_category(self, ch):
+        b_code = ch.encode(self.encoding)
+        return self.get_category(b_code.rjust(self.code_size, b'\x00'))
+
+    def to_arrays(self, panel):
+        # numpy columns of every code of a panel: code as int, code point
+        # of its strict decode with EMPTY for none, category id as an index
+        # of names with -1 for none, and valid flag. A code the codec only
+        # decodes in part has no code point and is not valid.
+        import numpy as np
+        table = self.code_table(self.define.get('panel' + panel))
+        codes = np.frombuffer(table.buffer, np.uint8).reshape(-1, table.width)
+        code = np.zeros(len(table), np.uint32)
+        for x in range(table.width):
+            code = code << 8 | codes[:, x]
+        names = list(self.class_ids())
+        category = self.category_ids(codes, names)
+        return OrderedDict((
+            ('code', code),
+            ('point', np.array(table.points, np.uint32)),
+            ('category', category),
+            ('valid', np.frombuffer(table.validity(), np.bool_).copy()),
+            ('names', np.array(names)),
+        ))
+
+    def category_ids(self, codes, names):
+        # category of each row of a byte matrix of codes, the masks of the
+        # box index are looked up for all codes at once. Names not in names
+        # are appended to it.
+        import numpy as np
+        index = self.category_index()
+        ids = np.full(len(codes), -1, np.int16)
+        pad = index.width - codes.shape[1]
+        if not index.names or pad < 0:
+            return ids
+        if len(index.names) > 64:
+            for x, row in enumerate(codes):
+                name = self.get_category(b'\x00' * pad + row.tobytes())
+                if name:
+                    if name not in names:
+                        names.append(name)
+                    ids[x] = names.index(name)
+            return ids
+        if pad:
+            codes = np.hstack([np.zeros((len(codes), pad), np.uint8), codes])
+        found = np.full(len(codes), np.iinfo(np.uint64).max, np.uint64)
+        for x, table in enumerate(index.tables):
+            table = np.array(table, np.uint64)
+            key = codes[:, x * 2].astype(np.intp)
+            if x * 2 + 1 < index.width:
+                key = key << 8 | codes[:, x * 2 + 1]
+            found &= table[key]
+        for name in index.names:
+            if name not in names:
+                names.append(name)
+        lookup = np.array([names.index(name) for name in index.names], np.int16)
+        # the lowest bit is the first matched range
+        lowest = found & (~found + np.uint64(1))
+        bit = np.log2(np.maximum(lowest, 1).astype(np.float64)).astype(np.intp)
+        ids[found != 0] = lookup[bit[found != 0]]
+        return ids
+
+    def code_ranges(self, rng):
+        # byte ranges of a code, leading zero bytes are not encoded
+        pairs = list(zip(rng[::2], rng[1::2]))
+        while len(pairs) > 1 and pairs[0] == (0, 0):
+            del pairs[0]
+        return pairs
+
+    def code_table(self, define):
+        ranges = tuple(self.code_ranges(define['range']))
+        table = self.tables.get(ranges)
+        if table is None:
+            table = CodeTable(self.encoding, ranges, cache=self.cache)
+            self.tables[ranges] = table
+        return table
+
+    def code_bytes(self, code):
+        return struct.pack('>L', int(code, 16))
 
     def chars(self, codes):
         chars = []
         for code in codes:
-            b_code = struct.pack('>L', int(code, 16))
-            ch = b_code.decode(self.encoding)
+            ch = self.code_bytes(code).decode(self.encoding)
             chars.append(ch)
         return chars
 
+    def chars_bulk(self, codes, sep=','):
+        # each distinct code is packed once and all codes are decoded in
+        # one codec call, same as ''.join(self.chars(codes))
+        if isinstance(codes, str):
+            codes = codes.split(sep)
+        else:
+            codes = list(codes)
+        packed = dict((code, self.code_bytes(code)) for code in set(codes))
+        return b''.join(map(packed.__getitem__, codes)).decode(self.encoding)
+
     def codes(self, chars):
-        codes = []
-        for ch in chars:
-            b_code = ch.encode(self.encoding)
-            fmt = '>%sB' % len(b_code)
-            code = ''.join(['%02X' % x for x in struct.unpack(fmt, b_code)])
-            codes.append(code.strip('0'))
-        return codes
-
-    def as_html(self, panels=None, errors=None):
+        return [self.format_code(ch.encode(self.encoding)) for ch in chars]
+
+    def format_code(self, b_code):
+        fmt = '>%sB' % len(b_code)
+        code = ''.join(['%02X' % x for x in struct.unpack(fmt, b_code)])
+        return code.strip('0')
+
+    def codes_bulk(self, text, sep=','):
+        # each distinct character is encoded once, same as
+        # sep.join(self.codes(text))
+        chars = list(set(text))
+        codes = dict(zip(chars, self.codes(chars)))
+        return sep.join(map(codes.__getitem__, text))
+
+    def as_html(self, panels=None, errors=None, jobs=None, page=None, collapse=False,
+                stylesheet=None):
+        return '\n'.join(self.iter_html(
+            panels=panels, errors=errors, jobs=jobs, page=page, collapse=collapse,
+            stylesheet=stylesheet))
+
+    def write_html(self, fileobj, panels=None, errors=None, jobs=None, page=None, collapse=False,
+                   stylesheet=None):
+        sep = ''
+        for line in self.iter_html(
+                panels=panels, errors=errors, jobs=jobs, page=page, collapse=collapse,
+                stylesheet=stylesheet):
+            fileobj.write(sep)
+            fileobj.write(line)
+            sep = '\n'
+
+    def iter_html(self, panels=None, errors=None, jobs=None, page=None, collapse=False,
+                  stylesheet=None):
+        # with page, only that page of a single panel is rendered. With
+        # collapse, rows and tables without a valid code are left out. With
+        # stylesheet, the page links to it instead of an inline style.
         if panels is None:
             panels = ['0']
         err_ch = errors if errors else ''
-        html = []
-        html.append('<!DOCTYPE html>')
-        html.append('<html>')
-        html.append('<head>')
-        html.append('<meta charset="UTF-8" />')
-        html.append('<title>%s</title>' % self.title)
-        html.append('<style type="text/css">')
-        html.append('table {border-collapse:collapse;border-spacing:0;}')
-        html.append('td {border:1px solid green;padding:0.3em;text-align:center;}')
-        html.append('hr {border:width:75%;}')
+        if page is None:
+            title = self.title
+        else:
+            self.check_page(panels, page)
+            define = self.panel_pages(self.define.get('panel' + panels[0]))[page]
+            title = '%s - %s' % (self.title, self.page_label(define))
+        for line in self.html_head(panels, title, stylesheet):
+            yield line
+        if page is None:
+            for line in self.html_intro():
+                yield line
+            if jobs and jobs > 1:
+                lines = self.iter_panels_parallel(panels, err_ch, jobs, collapse)
+            else:
+                lines = (line for p in panels for line in self.panel_as_html(p, err_ch, collapse))
+        else:
+            lines = self.page_as_html(panels[0], page, err_ch, collapse)
+        for line in lines:
+            yield line
+        yield '</body>'
+        yield '</html>'
+
+    def check_page(self, panels, page):
+        if len(panels) != 1:
+            raise ValueError('a page is of one panel, not %s' % ','.join(panels))
+        define = self.define.get('panel' + panels[0])
+        if define is None:
+            raise ValueError('unknown panel: %s' % panels[0])
+        count = len(self.panel_pages(define))
+        if not 0 <= page < count:
+            raise ValueError('panel %s has pages 0 to %s, not %s' % (panels[0], count - 1, page))
+
+    def html_head(self, panels, title, stylesheet=None):
+        yield '<!DOCTYPE html>'
+        yield '<html>'
+        yield '<head>'
+        yield '<meta charset="UTF-8" />'
+        yield '<title>%s</title>' % title
+        if stylesheet:
+            yield '<link rel="stylesheet" type="text/css" href="%s" />' % stylesheet
+        else:
+            yield '<style type="text/css">'
+            for line in self.style_as_css(panels):
+                yield line
+            yield '</style>'
+        yield '</head>'
+        yield '<body>'
+
+    def style_as_css(self, panels):
+        yield 'table {border-collapse:collapse;border-spacing:0;}'
+        yield 'td {border:1px solid green;padding:0.3em;text-align:center;}'
+        yield 'hr {border:width:75%;}'
         for p in panels:
             category = self.category.get('panel' + p)
             if not category:
                 continue
+            ids = self.class_ids()
             colors = get_colors(len(category))
             for x in range(len(category)):
-                html.append('.%s {background-color:%s;}' % (category[x]['name'], colors[x]))
-        html.append('</style>')
-        html.append('</head>')
-        html.append('<body>')
-        html.append('<h1>%s</h1>' % self.title)
-        html.append('<p>Made by Yugang LIU</p>')
-        html.append('<hr />')
-        html.append('<h2>Description</h2>')
+                yield '.%s {background-color:%s;}' % (ids[category[x]['name']], colors[x])
+
+    def html_intro(self):
+        yield '<h1>%s</h1>' % self.title
+        yield '<p>Made by Yugang LIU</p>'
+        yield '<hr />'
+        yield '<h2>Description</h2>'
         for desc in self.description:
-            html.append('<p>%s</p>' % desc)
-        html.append('<ul>')
-        html += ['<li>%s</li>' % item for item in self.detail]
-        html.append('</ul>')
-        html.append('<h2>Reference</h2>')
-        html.append('<ul>')
-        html.append('<li>wiki: <a href="%s" target="_blank">%s</a></li>' % (self.wiki, self.wiki))
-        html.append('</ul>')
-        html.append('<h2>Code Table</h2>')
+            yield '<p>%s</p>' % desc
+        yield '<ul>'
+        for item in self.detail:
+            yield '<li>%s</li>' % item
+        yield '</ul>'
+        yield '<h2>Reference</h2>'
+        yield '<ul>'
+        yield '<li>wiki: <a href="%s" target="_blank">%s</a></li>' % (self.wiki, self.wiki)
+        yield '</ul>'
+        yield '<h2>Code Table</h2>'
+
+    def iter_panels_parallel(self, panels, err_ch, jobs, collapse=False):
+        # panel slices are rendered by worker processes and joined in order,
+        # at most jobs * 2 slices are pending at once.
+        from concurrent.futures import ProcessPoolExecutor
+        pending = deque()
+        with ProcessPoolExecutor(jobs) as executor:
+            for p in panels:
+                define = self.define.get('panel' + p)
+                pending.append(list(self.panel_legend_as_html(p)))
+                for part in self.panel_slices(define):
+                    pending.append(executor.submit(render_slice, type(self), part, err_ch, collapse))
+                    while len(pending) > jobs * 2:
+                        for line in slice_lines(pending.popleft()):
+                            yield line
+            while pending:
+                for line in slice_lines(pending.popleft()):
+                    yield line
+
+    def panel_slices(self, define):
+        # independent parts of a panel, rendered one after another they
+        # give the whole panel
+        return [define]
+
+    def panel_pages(self, define):
+        # pages of a panel, each page is rendered to its own file
+        return self.panel_slices(define)
+
+    def page_label(self, define):
+        ranges = self.code_ranges(define['range'])
+        return '%s - %s' % (
+            ''.join(['%02X' % lo for lo, hi in ranges]),
+            ''.join(['%02X' % hi for lo, hi in ranges]),
+        )
+
+    def page_filename(self, panel, page):
+        return 'panel%s-%03d.html' % (panel, page)
+
+    def page_nav_as_html(self, panel, page, count):
+        links = ['<a href="index.html">Index</a>']
+        if page > 0:
+            links.append('<a href="%s">Previous</a>' % self.page_filename(panel, page - 1))
+        if page + 1 < count:
+            links.append('<a href="%s">Next</a>' % self.page_filename(panel, page + 1))
+        yield '<p>%s</p>' % ' | '.join(links)
+
+    def page_as_html(self, panel, page, err_ch, collapse=False):
+        pages = self.panel_pages(self.define.get('panel' + panel))
+        yield '<h1>%s</h1>' % self.title
+        for line in self.page_nav_as_html(panel, page, len(pages)):
+            yield line
+        for line in self.panel_legend_as_html(panel):
+            yield line
+        yield '<h3>%s</h3>' % self.page_label(pages[page])
+        for line in self.render_panel(pages[page], err_ch, collapse):
+            yield line
+        for line in self.page_nav_as_html(panel, page, len(pages)):
+            yield line
+
+    def index_as_html(self, panels, stylesheet=None):
+        for line in self.html_head([], self.title, stylesheet):
+            yield line
+        for line in self.html_intro():
+            yield line
         for p in panels:
-            html += self.panel_as_html(p, err_ch)
-        html.append('</body>')
-        html.append('</html>')
-        return '\n'.join(html)
+            define = self.define.get('panel' + p)
+            yield '<h3>%s</h3>' % ' - '.join(define['desc'])
+            yield '<ul>'
+            for x, part in enumerate(self.panel_pages(define)):
+                yield '<li><a href="%s">%s</a></li>' % (self.page_filename(p, x), self.page_label(part))
+            yield '</ul>'
+        yield '</body>'
+        yield '</html>'
+
+    def write_pages(self, path, panels=None, errors=None, jobs=None, collapse=False, compress=None):
+        # one file per page of panels and index.html linking them, all
+        # pages share one stylesheet. With compress, every file is written
+        # compressed with its suffix added, links keep the plain names for
+        # servers of precompressed files.
+        if panels is None:
+            panels = ['0']
+        err_ch = errors if errors else ''
+        suffix = COMPRESS_SUFFIX[compress] if compress else ''
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        filename = os.path.join(path, self.stylesheet) + suffix
+        with open_output(filename, compress) as f:
+            f.write('\n'.join(self.style_as_css(panels)) + '\n')
+        filenames = [filename]
+        pages = [
+            (p, x) for p in panels
+            for x in range(len(self.panel_pages(self.define.get('panel' + p))))
+        ]
+        if jobs and jobs > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(jobs) as executor:
+                futures = [
+                    executor.submit(
+                        write_page, type(self), self.cache, path, p, x, err_ch, collapse,
+                        self.stylesheet, compress)
+                    for p, x in pages
+                ]
+                filenames += [future.result() for future in futures]
+        else:
+            for p, x in pages:
+                filename = os.path.join(path, self.page_filename(p, x)) + suffix
+                with open_output(filename, compress) as f:
+                    self.write_html(
+                        f, panels=[p], errors=err_ch, page=x, collapse=collapse,
+                        stylesheet=self.stylesheet)
+                filenames.append(filename)
+        filename = os.path.join(path, 'index.html') + suffix
+        with open_output(filename, compress) as f:
+            f.write('\n'.join(self.index_as_html(panels, self.stylesheet)))
+        filenames.append(filename)
+        return filenames
+
+    def panel_as_html(self, panel, err_ch, collapse=False):
+        define = self.define.get('panel' + panel)
+        for line in self.panel_legend_as_html(panel):
+            yield line
+        for line in self.render_panel(define, err_ch, collapse):
+            yield line
+
+    def validity(self, panel):
+        return self.code_table(self.define.get('panel' + panel)).validity()
 
-    def panel_as_html(self, panel, err_ch):
+    def render_panel(self, define, err_ch, collapse=False):
+        if not collapse:
+            return self.do_panel_as_html(define, err_ch)
+        return self.collapse_panel(define, err_ch)
+
+    def collapse_panel(self, define, err_ch):
+        # tables without a valid code are skipped without rendering them
+        for part in self.panel_slices(define):
+            for line in self.do_panel_as_html(part, err_ch, collapse=True):
+                yield line
+
+    def panel_legend_as_html(self, panel):
         define = self.define.get('panel' + panel)
-        html = []
-        html.append('<h3>%s</h3>' % ' - '.join(define['desc']))
+        yield '<h3>%s</h3>' % ' - '.join(define['desc'])
         category = self.category.get('panel' + panel)
         if category:
-            html.append('<table>')
+            ids = self.class_ids()
+            yield '<table>'
             for c in category:
-                html.append('<tr>')
-                html.append('<td class="%s">%s</td>' % (
-                    c['name'],
+                yield '<tr>'
+                yield '<td class="%s">%s</td>' % (
+                    ids[c['name']],
                     '%s - %s' % (c['desc'], c['name'].replace('_', ' ')),
-                ))
-                html.append('</tr>')
-            html.append('</table>')
-            html.append('<p></p>')
-        html += self.do_panel_as_html(define, err_ch)
-        return html
-
-    def do_panel_as_html(self, define, err_ch):
+                )
+                yield '</tr>'
+            yield '</table>'
+            yield '<p></p>'
+
+    def do_panel_as_html(self, define, err_ch, collapse=False):
         return []
+
+    def header_row(self, labels, corner='<td></td>'):
+        return '<tr>' + corner + ''.join(['<td>%s</td>' % x for x in labels]) + '</tr>'
+
+    def table_as_html(self, cells, header, labels, columns, pad=b'', title=None, collapse=False,
+                      head=True, tail=True):
+        # a code table of len(labels) rows of columns cells taken from
+        # cells, after its title. header is the list of header rows, built
+        # once by the caller for all tables of a panel. A cell gets the
+        # class id of its category, pad makes the code code_size bytes for
+        # get_category. With collapse, rows without a valid code are left
+        # out, and a table without one is left out with its title. Rows of
+        # a table split over slices are rendered without the title and
+        # header unless head, and without the end of the table unless tail.
+        if collapse and head and tail and labels and not cells.any_valid(len(labels) * columns):
+            cells.skip(len(labels) * columns)
+            return
+        tags = self.cell_tags()
+        get_category = self.get_category
+        if head:
+            if title:
+                yield title
+            yield '<table>'
+            for line in header:
+                yield line
+        for label in labels:
+            if collapse and not cells.any_valid(columns):
+                cells.skip(columns)
+                continue
+            row = ['<tr>', label]
+            for b_code, ch in cells.take(columns):
+                row.append(tags[get_category(pad + b_code)] + ch + '</td>')
+            row.append('</tr>')
+            yield ''.join(row)
+        if tail:
+            yield '</table>'
@@ -0,0 +1,409 @@
+#!/usr/bin/env python
+# -*- encoding:utf-8 -*-
+
+import io
+import sys
+import gc
+import json
+import time
+import random
+import argparse
+import subprocess
+import tracemalloc
+from collections import OrderedDict
+
+from charset import CHARSET_CLASS
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+STARTUP_ARGV = ['-m', 'charset', '--encoding', 'gbk', '--code', u'我']
+
+# a code lookup must not import these
+STARTUP_EXCLUDE = [
+    'webcolors',
+    'hashlib',
+    'concurrent.futures',
+    'charset.annotate',
+    'charset.unicode_category',
+    'charset.unicode_charset',
+]
+
+# a timed run repeats a case until it takes this long, in batches of
+# calls of at least BATCH_SECONDS. Shorter runs are mostly timer noise.
+MIN_SECONDS = 0.2
+BATCH_SECONDS = 0.01
+
+
+def peak_rss():
+    # peak resident set size of the process in bytes
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        return rss
+    return rss * 1024
+
+
+def sample_text(charset, size, seed=0):
+    # mixed text of CJK characters, punctuation and ASCII words which the
+    # charset can encode
+    rnd = random.Random(seed)
+    cjk = [chr(x) for x in range(0x4e00, 0x9fa6)]
+    punct = list(u'，。、；：？！“”《》（）')
+    words = ['log', 'id', '2016', 'OK', 'error', ' ', ' ', '\n']
+    pieces = []
+    length = 0
+    while length < size:
+        x = rnd.random()
+        if x < 0.8:
+            piece = rnd.choice(cjk)
+        elif x < 0.9:
+            piece = rnd.choice(punct)
+        else:
+            piece = rnd.choice(words)
+        try:
+            b_piece = piece.encode(charset.encoding)
+        except UnicodeEncodeError:
+            continue
+        if charset.code_size == 2 and len(b_piece) != 2 * len(piece):
+            continue
+        pieces.append(piece)
+        length += len(piece)
+    return ''.join(pieces)[:size]
+
+
+def timed_batch(func, loops):
+    start = time.perf_counter()
+    for x in range(loops):
+        func()
+    return time.perf_counter() - start
+
+
+def timed_run(func, min_seconds=MIN_SECONDS):
+    # seconds of one call in the fastest batch, the batches fill
+    # min_seconds
+    gc.collect()
+    loops = 1
+    elapsed = timed_batch(func, loops)
+    while elapsed < BATCH_SECONDS:
+        loops *= 10 if elapsed < BATCH_SECONDS / 10 else 2
+        elapsed = timed_batch(func, loops)
+    total = elapsed
+    best = elapsed / loops
+    while total < min_seconds:
+        elapsed = timed_batch(func, loops)
+        total += elapsed
+        best = min(best, elapsed / loops)
+    return best
+
+
+def measure(name, func, count, trace=True, repeat=3):
+    # best time of repeated runs, then one more run to trace allocations
+    seconds = None
+    for x in range(repeat):
+        elapsed = timed_run(func)
+        if seconds is None or elapsed < seconds:
+            seconds = elapsed
+    alloc = None
+    if trace:
+        gc.collect()
+        tracemalloc.start()
+        func()
+        alloc = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return OrderedDict((
+        ('name', name),
+        ('count', count),
+        ('seconds', seconds),
+        ('ops', count / seconds if seconds else None),
+        ('alloc_peak', alloc),
+        ('rss_peak', peak_rss()),
+    ))
+
+
+def bench_html(cls, panels=None, max_cells=None, trace=True, repeat=3):
+    charset = cls()
+    for key in sorted(charset.define, key=lambda x: int(x[5:])):
+        panel = key[5:]
+        if panels and panel not in panels:
+            continue
+        cells = panel_cells(charset, key)
+        if max_cells and cells > max_cells:
+            continue
+
+        def render(panel=panel):
+            for line in cls().iter_html(panels=[panel]):
+                pass
+        yield measure('html/%s' % panel, render, cells, trace, repeat)
+
+
+class ByteCounter(io.RawIOBase):
+    # binary sink counting the bytes written to it
+    def __init__(self):
+        self.count = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.count += len(data)
+        return len(data)
+
+
+def panel_cells(charset, key):
+    cells = 1
+    for lo, hi in charset.code_ranges(charset.define[key]['range']):
+        cells *= hi - lo + 1
+    return cells
+
+
+def bench_compress(cls, panels=None, max_cells=None, methods=('none', 'gzip', 'zlib', 'xz'),
+                   trace=True, repeat=3):
+    # wall time and bytes of a panel written through each compression, the
+    # output goes to a counter instead of a file
+    from charset.utils import compressed_text
+    charset = cls()
+    for key in sorted(charset.define, key=lambda x: int(x[5:])):
+        panel = key[5:]
+        if panels and panel not in panels:
+            continue
+        cells = panel_cells(charset, key)
+        if max_cells and cells > max_cells:
+            continue
+        for method in methods:
+            written = []
+
+            def write(panel=panel, method=method, written=written):
+                counter = ByteCounter()
+                if method == 'none':
+                    f = io.TextIOWrapper(io.BufferedWriter(counter), encoding='utf-8')
+                else:
+                    f = compressed_text(counter, method)
+                cls().write_html(f, panels=[panel])
+                f.close()
+                written.append(counter.count)
+            result = measure('%s/%s' % (method, panel), write, cells, trace, repeat)
+            result['bytes'] = written[-1]
+            yield result
+
+
+def bench_codes(cls, size, trace=True, repeat=3):
+    charset = cls()
+    text = sample_text(charset, size)
+    codes = charset.codes(text)
+    if charset.encoding.startswith('utf-32'):
+        codes = [code[2:] for code in codes]
+    # codes() strips trailing zeros, only codes of whole bytes go back
+    codes = [code for code in codes if code and len(code) % 2 == 0]
+    b_codes = [ch.encode(charset.encoding).rjust(charset.code_size, b'\x00') for ch in text]
+
+    def category():
+        for b_code in b_codes:
+            charset.get_category(b_code)
+    yield measure('get_category', category, len(b_codes), trace, repeat)
+    yield measure('codes', lambda: charset.codes(text), len(text), trace, repeat)
+    yield measure('codes_bulk', lambda: charset.codes_bulk(text), len(text), trace, repeat)
+    yield measure('chars', lambda: charset.chars(codes), len(codes), trace, repeat)
+    yield measure('chars_bulk', lambda: charset.chars_bulk(codes), len(codes), trace, repeat)
+
+
+def bench_detect(encoding, size, trace=True, repeat=3):
+    # detection of multi-MB text in the charset
+    from charset.detector import detect, DETECT_ENCODINGS
+    if encoding not in DETECT_ENCODINGS:
+        return
+    charset = CHARSET_CLASS[encoding]()
+    data = sample_text(charset, size).encode(charset.encoding)
+    yield measure('detect', lambda: detect(data), len(data), trace, repeat)
+
+
+def startup_imports(argv=STARTUP_ARGV):
+    proc = subprocess.Popen(
+        [sys.executable, '-X', 'importtime'] + argv,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    err = proc.communicate()[1]
+    modules = set()
+    for line in err.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            modules.add(line.rsplit('|', 1)[1].strip())
+    return modules
+
+
+def bench_startup(repeat=3):
+    def start():
+        subprocess.check_call([sys.executable] + STARTUP_ARGV, stdout=subprocess.DEVNULL)
+    result = measure('startup', start, 1, False, repeat)
+    modules = startup_imports()
+    result['imports'] = len(modules)
+    result['excluded'] = sorted([
+        name for name in modules
+        if any(name == x or name.startswith(x + '.') for x in STARTUP_EXCLUDE)
+    ])
+    return result
+
+
+def run(encodings, panels=None, max_cells=None, size=100000, trace=True, repeat=3):
+    for encoding in encodings:
+        cls = CHARSET_CLASS[encoding]
+        for result in bench_codes(cls, size, trace, repeat):
+            yield encoding, result
+        for result in bench_detect(encoding, size * 10, trace, repeat):
+            yield encoding, result
+        for result in bench_html(cls, panels, max_cells, trace, repeat):
+            yield encoding, result
+
+
+def format_result(encoding, result, previous=None):
+    line = '%-8s %-14s %9d %9.3fs %12s ops/s' % (
+        encoding, result['name'], result['count'], result['seconds'],
+        '%.0f' % result['ops'] if result['ops'] else '-',
+    )
+    if result['alloc_peak'] is not None:
+        line += ' %8.1f MB alloc' % (result['alloc_peak'] / 1e6)
+    if result['rss_peak'] is not None:
+        line += ' %8.1f MB rss' % (result['rss_peak'] / 1e6)
+    if result.get('bytes') is not None:
+        line += ' %10.1f KB' % (result['bytes'] / 1e3)
+    if previous and previous.get('ops') and result['ops']:
+        line += ' %6.2fx' % (result['ops'] / previous['ops'])
+    return line
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='python -m charset.bench',
+        description='Benchmark charset rendering, category lookup and code conversion.',
+    )
+    parser.add_argument(
+        '--encoding',
+        action='append',
+        choices=CHARSET_CLASS.keys(),
+        help='benchmark charset, may be repeated. default: all'
+    )
+    parser.add_argument(
+        '--panel',
+        help='render only these panels, e.g. 0,1'
+    )
+    parser.add_argument(
+        '--max-cells',
+        type=int,
+        help='skip panels with more cells'
+    )
+    parser.add_argument(
+        '--size',
+        type=int,
+        default=100000,
+        help='characters of sample text. default: 100000'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=3,
+        help='best of N runs of at least %ss each. default: 3' % MIN_SECONDS
+    )
+    parser.add_argument(
+        '--no-trace',
+        action='store_true',
+        help='do not measure allocations with tracemalloc'
+    )
+    parser.add_argument(
+        '--startup',
+        action='store_true',
+        help='only measure startup of "charset --encoding gbk --code"'
+    )
+    parser.add_argument(
+        '--startup-target',
+        type=float,
+        default=0.2,
+        help='startup seconds reported as regression. default: 0.2'
+    )
+    parser.add_argument(
+        '--compress',
+        action='store_true',
+        help='only measure HTML output of panels through gzip, zlib and xz'
+    )
+    parser.add_argument(
+        '--json',
+        help='write results to JSON file'
+    )
+    parser.add_argument(
+        '--compare',
+        help='compare with results of JSON file'
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.1,
+        help='slowdown reported as regression. default: 0.1'
+    )
+    args = parser.parse_args()
+
+    previous = {}
+    if args.compare:
+        with open(args.compare) as f:
+            for item in json.load(f)['results']:
+                previous[(item['encoding'], item['name'])] = item
+
+    results = []
+    regressions = []
+    if args.startup:
+        benchmarks = [('-', bench_startup(args.repeat))]
+    elif args.compress:
+        benchmarks = (
+            (encoding, result)
+            for encoding in args.encoding or list(CHARSET_CLASS.keys())
+            for result in bench_compress(
+                CHARSET_CLASS[encoding],
+                panels=args.panel.split(',') if args.panel else None,
+                max_cells=args.max_cells,
+                trace=not args.no_trace,
+                repeat=args.repeat,
+            )
+        )
+    else:
+        benchmarks = run(
+            args.encoding or list(CHARSET_CLASS.keys()),
+            panels=args.panel.split(',') if args.panel else None,
+            max_cells=args.max_cells,
+            size=args.size,
+            trace=not args.no_trace,
+            repeat=args.repeat,
+        )
+    for encoding, result in benchmarks:
+        prev = previous.get((encoding, result['name']))
+        print(format_result(encoding, result, prev))
+        sys.stdout.flush()
+        if prev and prev.get('ops') and result['ops']:
+            if result['ops'] < prev['ops'] * (1 - args.threshold):
+                regressions.append((encoding, result['name']))
+        if result['name'] == 'startup':
+            if result['excluded']:
+                print('Imported at startup: %s' % ', '.join(result['excluded']))
+                regressions.append((encoding, 'startup imports'))
+            if result['seconds'] > args.startup_target:
+                regressions.append((encoding, 'startup target'))
+        item = OrderedDict([('encoding', encoding)])
+        item.update(result)
+        results.append(item)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'python': sys.version,
+                'platform': sys.platform,
+                'results': results,
+            }, f, indent=2)
+    if regressions:
+        print('Regression: %s' % ', '.join(['%s %s' % x for x in regressions]))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# -*- encoding:utf-8 -*-
+
+import os
+import io
+import sys
+import json
+import types
+import hashlib
+import unicodedata
+from collections import OrderedDict
+
+from charset import version, CHARSET_CLASS
+from charset.utils import open_output, compress_of
+
+
+# hashes of the last build of each output, beside the manifest
+STATE_FILE = '.charset-build.json'
+
+
+def read_manifest(path):
+    # one target a line: encoding, comma separated panels and output file,
+    # relative to the manifest. Blank lines and lines of # are skipped.
+    base = os.path.dirname(os.path.abspath(path))
+    targets = []
+    with io.open(path, encoding='utf-8') as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            fields = line.split()
+            if len(fields) != 3 or fields[0] not in CHARSET_CLASS:
+                raise ValueError('%s:%s: bad target: %s' % (path, lineno, line))
+            encoding, panels, output = fields
+            panels = panels.split(',')
+            define = CHARSET_CLASS[encoding].define
+            for panel in panels:
+                if 'panel' + panel not in define:
+                    raise ValueError('%s:%s: unknown panel of %s: %s' % (path, lineno, encoding, panel))
+            targets.append((encoding, panels, os.path.join(base, output)))
+    return targets
+
+
+def render_modules(cls):
+    # modules of the class and its bases, with the charset modules they
+    # use, such as the renderer helpers and the Unicode block data
+    modules = set()
+    for klass in cls.__mro__:
+        module = sys.modules[klass.__module__]
+        if not module.__name__.startswith('charset'):
+            continue
+        modules.add(module.__name__)
+        for value in vars(module).values():
+            if isinstance(value, types.ModuleType):
+                name = value.__name__
+            else:
+                name = getattr(value, '__module__', None)
+            if isinstance(name, str) and name.startswith('charset.'):
+                modules.add(name)
+    return modules
+
+
+def source_digest(modules):
+    digest = hashlib.sha256()
+    for name in sorted(modules):
+        module = sys.modules[name]
+        with open(module.__file__, 'rb') as f:
+            digest.update(name.encode('utf-8'))
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def json_default(obj):
+    # category of Unicode is read-only mappings
+    return dict(obj)
+
+
+def target_hash(encoding, panels):
+    # everything a page depends on: the charset data, the codec and unicode
+    # versions, the colours and the source of the renderer
+    import webcolors
+    cls = CHARSET_CLASS[encoding]
+    data = json.dumps([
+        version,
+        sys.version,
+        unicodedata.unidata_version,
+        webcolors.__version__,
+        encoding,
+        panels,
+        cls.title,
+        cls.description,
+        cls.detail,
+        cls.wiki,
+        cls.encoding,
+        cls.define,
+        cls.category,
+        source_digest(render_modules(cls)),
+    ], sort_keys=True, default=json_default)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def build_target(encoding, panels, output, cache=None):
+    # the output is replaced only when it is written in full, it is
+    # compressed by its suffix like the output of the CLI
+    charset = CHARSET_CLASS[encoding](cache=cache)
+    directory = os.path.dirname(output)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+    tmp = '%s.%s.tmp' % (output, os.getpid())
+    try:
+        with open_output(tmp, compress_of(output)) as f:
+            charset.write_html(f, panels=panels)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    os.replace(tmp, output)
+    return output
+
+
+def load_state(path):
+    try:
+        with io.open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(path, state):
+    tmp = '%s.%s.tmp' % (path, os.getpid())
+    with io.open(tmp, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(state, indent=2, sort_keys=True))
+    os.replace(tmp, path)
+
+
+def build(manifest, jobs=None, force=False, dry_run=False, cache=None):
+    # targets whose output exists with the hash of the last build are
+    # skipped, the rest are rendered, by a process pool with jobs. Returns
+    # output -> 'skip' or 'build' in manifest order. The state is saved
+    # after each target, an interrupted build keeps what is done.
+    targets = read_manifest(manifest)
+    state_path = os.path.join(os.path.dirname(os.path.abspath(manifest)), STATE_FILE)
+    state = load_state(state_path)
+    result = OrderedDict()
+    todo = []
+    for encoding, panels, output in targets:
+        digest = target_hash(encoding, panels)
+        key = os.path.relpath(output, os.path.dirname(state_path))
+        if not force and state.get(key) == digest and os.path.exists(output):
+            result[output] = 'skip'
+        else:
+            result[output] = 'build'
+            todo.append((encoding, panels, output, key, digest))
+    if dry_run or not todo:
+        return result
+    if jobs and jobs > 1 and len(todo) > 1:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        with ProcessPoolExecutor(jobs) as executor:
+            futures = dict(
+                (executor.submit(build_target, encoding, panels, output, cache), (key, digest))
+                for encoding, panels, output, key, digest in todo
+            )
+            for future in as_completed(futures):
+                future.result()
+                key, digest = futures[future]
+                state[key] = digest
+                save_state(state_path, state)
+    else:
+        for encoding, panels, output, key, digest in todo:
+            build_target(encoding, panels, output, cache)
+            state[key] = digest
+            save_state(state_path, state)
+    return result
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- encoding:utf-8 -*-
+
+import os
+import sys
+import mmap
+import glob
+import unicodedata
+
+
+# layout of the cached tables, a new one leaves the old files stale
+FORMAT = 2
+
+
+def default_cache_dir():
+    path = os.environ.get('CHARSET_CACHE_DIR')
+    if path:
+        return path
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'charset')
+
+
+class TableCache(object):
+    # code points of CodeTable as binary files, one file per encoding and
+    # panel ranges. The file name carries a digest of the interpreter and
+    # unicode versions, the codec tables only change with them.
+    def __init__(self, path=None, max_entries=1024, rebuild=False):
+        self.path = path or default_cache_dir()
+        self.max_entries = max_entries
+        self.rebuild = rebuild
+
+    def prefix(self, encoding, ranges):
+        return '%s-%s' % (encoding, ''.join(['%02x%02x' % r for r in ranges]))
+
+    def filename(self, encoding, ranges):
+        # hashlib loads openssl, only pay for it when a table is built
+        import hashlib
+        version = '%s|%s|%s|%s' % (
+            FORMAT, sys.version, unicodedata.unidata_version, sys.byteorder)
+        digest = hashlib.sha1(version.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.path, '%s-%s.bin' % (self.prefix(encoding, ranges), digest))
+
+    def load(self, encoding, ranges, count):
+        if self.rebuild:
+            return None
+        filename = self.filename(encoding, ranges)
+        try:
+            with open(filename, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size % 4 or (count is not None and size != count * 4):
+                    return None
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            os.utime(filename, None)
+        except (OSError, ValueError):
+            return None
+        return memoryview(mm).cast('I')
+
+    def store(self, encoding, ranges, points):
+        filename = self.filename(encoding, ranges)
+        try:
+            if not os.path.isdir(self.path):
+                os.makedirs(self.path)
+            tmp = '%s.%s.tmp' % (filename, os.getpid())
+            with open(tmp, 'wb') as f:
+                f.write(points.tobytes())
+            os.replace(tmp, filename)
+        except OSError:
+            return
+        # drop entries of other versions, then the least recently used
+        prefix = os.path.join(self.path, self.prefix(encoding, ranges))
+        for stale in glob.glob(glob.escape(prefix) + '-*.bin'):
+            if stale != filename:
+                self.remove(stale)
+        entries = glob.glob(os.path.join(glob.escape(self.path), '*.bin'))
+        if len(entries) > self.max_entries:
+            entries.sort(key=self.mtime)
+            for stale in entries[:len(entries) - self.max_entries]:
+                self.remove(stale)
+
+    def mtime(self, filename):
+        # another process may have removed it already
+        try:
+            return os.path.getmtime(filename)
+        except OSError:
+            return 0
+
+    def remove(self, filename):
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
+
+    def clear(self):
+        for filename in glob.glob(os.path.join(glob.escape(self.path), '*.bin')):
+            self.remove(filename)
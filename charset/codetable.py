@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- encoding:utf-8 -*-
+
+import sys
+import unicodedata
+from array import array
+from bisect import bisect_left
+
+
+EMPTY = 0xffffffff
+NATIVE_UTF32 = 'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be'
+CHUNK = 4096
+
+
+def build_codes(ranges):
+    # every code of the byte ranges in order, concatenated into one buffer.
+    # Byte x of the codes is a column of the buffer, written in one slice.
+    width = len(ranges)
+    count = 1
+    for lo, hi in ranges:
+        count *= hi - lo + 1
+    buf = bytearray(count * width)
+    inner = count
+    outer = 1
+    for x, (lo, hi) in enumerate(ranges):
+        size = hi - lo + 1
+        inner //= size
+        column = b''.join([bytes(bytearray([v])) * inner for v in range(lo, hi + 1)])
+        buf[x::width] = column * outer
+        outer *= size
+    return bytes(buf)
+
+
+class CodeTable(object):
+    # characters of all codes in a panel. Codes are fixed width, the
+    # characters are stored as code points with EMPTY for codes not decoded
+    # strictly to one character. A code the codec decodes only in part,
+    # like GBK 817F to DEL, is EMPTY too; the rest of it is only kept as
+    # the text shown for it, in sorted partial_index and partial_points.
+    def __init__(self, encoding, ranges, cache=None):
+        self.encoding = encoding
+        self.ranges = tuple(ranges)
+        self.width = len(self.ranges)
+        self.buffer = build_codes(self.ranges)
+        self.count = len(self.buffer) // self.width
+        self.points = None
+        self.partial = None
+        self.valid = None
+        if cache:
+            self.points = cache.load(self.encoding, self.ranges, self.count)
+            self.partial = cache.load(self.encoding + '-partial', self.ranges, None)
+        if self.points is None or self.partial is None:
+            self.points, self.partial = self.decode()
+            if cache:
+                cache.store(self.encoding, self.ranges, self.points)
+                cache.store(self.encoding + '-partial', self.ranges, self.partial)
+        # count of partial codes, then their indexes and code points
+        n = self.partial[0]
+        self.partial_index = self.partial[1:n + 1]
+        self.partial_points = self.partial[n + 1:]
+
+    def __len__(self):
+        return self.count
+
+    def decode(self):
+        # decode runs of valid codes in one codec call, stopping at the
+        # first invalid code. Invalid codes are decoded alone as before,
+        # one by one until the next valid code.
+        points = array('I')
+        partial = []
+        view = memoryview(self.buffer)
+        w = self.width
+        pos = 0
+        while pos < self.count:
+            stop = min(pos + CHUNK, self.count)
+            invalid = False
+            try:
+                text = str(view[pos * w:stop * w], self.encoding)
+            except UnicodeDecodeError as err:
+                stop = pos + err.start // w
+                invalid = True
+                text = str(view[pos * w:stop * w], self.encoding)
+            if len(text) == stop - pos:
+                points.frombytes(text.encode(NATIVE_UTF32))
+            else:
+                points.extend([self.decode_code(x, partial) for x in range(pos, stop)])
+            pos = stop
+            while invalid and pos < self.count:
+                points.append(self.decode_code(pos, partial))
+                pos += 1
+                if pos < self.count:
+                    invalid = u'\ufffd' in self.code(pos).decode(self.encoding, errors='replace')
+        data = array('I', [len(partial)])
+        data.extend([x for x, p in partial])
+        data.extend([p for x, p in partial])
+        return points, data
+
+    def validity(self):
+        # one byte per code, 1 for a code decoded to an assigned character.
+        # Undecodable codes and unassigned code points are 0.
+        if self.valid is None:
+            category = unicodedata.category
+            valid = bytearray(self.count)
+            for x, p in enumerate(self.points):
+                if p != EMPTY and category(chr(p)) != 'Cn':
+                    valid[x] = 1
+            self.valid = valid
+        return self.valid
+
+    def any_valid(self, start, stop):
+        return 1 in self.validity()[start:stop]
+
+    def decode_code(self, index, partial):
+        # code point of a strict decode to one character. Otherwise what is
+        # left of the code without its undecodable bytes goes to partial.
+        code = self.code(index)
+        try:
+            ch = code.decode(self.encoding)
+        except UnicodeDecodeError:
+            ch = None
+        if ch and len(ch) == 1:
+            return ord(ch)
+        ch = code.decode(self.encoding, errors='ignore')
+        if len(ch) > 1:
+            raise ValueError('code %r of %s is decoded to %r' % (code, self.encoding, ch))
+        if ch:
+            partial.append((index, ord(ch)))
+        return EMPTY
+
+    def code(self, index):
+        return self.buffer[index * self.width:(index + 1) * self.width]
+
+    def chars(self, start=0, stop=None, err_ch=''):
+        points = self.points[start:stop]
+        if EMPTY not in points:
+            return list(points.tobytes().decode(NATIVE_UTF32))
+        chars = [err_ch if p == EMPTY else chr(p) for p in points]
+        # partial codes are shown with what is left of them
+        stop = self.count if stop is None else min(stop, self.count)
+        lo = bisect_left(self.partial_index, start)
+        hi = bisect_left(self.partial_index, stop)
+        for x in range(lo, hi):
+            chars[self.partial_index[x] - start] = chr(self.partial_points[x])
+        return chars
+
+    def cells(self, err_ch=''):
+        return Cells(self, err_ch)
+
+
+class Cells(object):
+    # the (code, character) cells of a table read in code order, a row at
+    # a time. Rows can be skipped without building them.
+    def __init__(self, table, err_ch=''):
+        self.table = table
+        self.err_ch = err_ch
+        self.pos = 0
+
+    def any_valid(self, count):
+        return self.table.any_valid(self.pos, self.pos + count)
+
+    def skip(self, count):
+        self.pos += count
+
+    def take(self, count):
+        table = self.table
+        w = table.width
+        start = self.pos
+        self.pos += count
+        chars = table.chars(start, self.pos, self.err_ch)
+        return [(table.buffer[x * w:(x + 1) * w], ch) for x, ch in enumerate(chars, start)]
@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+# -*- encoding:utf-8 -*-
+
+from array import array
+
+from charset.codetable import CodeTable, EMPTY
+
+
+# codes are ints: GB2312 区位 as qu * 100 + wei like GB2312.codes, GBK and
+# GB18030 codes as their bytes read big endian, Unicode as code points.
+# Missing codes convert to EMPTY. Codes in a numpy array are converted
+# by indexing the tables with the whole array and give a numpy array of
+# uint32, other iterables are converted a code at a time to array('I').
+ENCODINGS = ('gb2312', 'gbk', 'gb18030', 'unicode')
+
+# dense tables of code -> code point, 0 for a missing code. The index of
+# a code is its position in the byte ranges.
+DENSE_RANGES = {
+    'gb2312': ('gb2312', ((0xa1, 0xfe), (0xa1, 0xfe))),
+    'gbk': ('gbk', ((0x81, 0xfe), (0x40, 0xfe))),
+    'gb18030': ('gb18030', ((0x81, 0xfe), (0x40, 0xfe))),
+    # four byte codes of the BMP, the rest of the planes are linear
+    'gb18030-4': ('gb18030', ((0x81, 0x84), (0x30, 0x39), (0x81, 0xfe), (0x30, 0x39))),
+}
+
+GB18030_SUPPLEMENTARY = 0x90308130
+GB18030_SUPPLEMENTARY_END = 0xe3329a35
+
+TABLES = {}
+
+
+def dense_table(name, cache=None):
+    table = TABLES.get(name)
+    if table is None:
+        encoding, ranges = DENSE_RANGES[name]
+        points = CodeTable(encoding, ranges, cache=cache).points
+        table = TABLES[name] = array('H', [0 if p == EMPTY else p for p in points])
+    return table
+
+
+def is_ndarray(obj):
+    # numpy is only imported when it is given
+    return type(obj).__name__ == 'ndarray' and type(obj).__module__ == 'numpy'
+
+
+def np_table(table):
+    import numpy as np
+    return np.frombuffer(table, np.uint16 if table.typecode == 'H' else np.uint32)
+
+
+def np_codes(codes):
+    import numpy as np
+    return np.asarray(codes, np.int64)
+
+
+def np_lookup(table, ok, index):
+    # points of table at index where ok and not 0, EMPTY elsewhere
+    import numpy as np
+    points = np_table(table)[np.where(ok, index, 0)].astype(np.uint32)
+    return np.where(ok & (points != 0), points, np.uint32(EMPTY))
+
+
+def linear4(code):
+    # position of a four byte GB18030 code counted from 81308130
+    b1, b2, b3, b4 = code >> 24, code >> 16 & 0xff, code >> 8 & 0xff, code & 0xff
+    if not (0x30 <= b2 <= 0x39 and 0x81 <= b3 <= 0xfe and 0x30 <= b4 <= 0x39):
+        return -1
+    return (((b1 - 0x81) * 10 + b2 - 0x30) * 126 + b3 - 0x81) * 10 + b4 - 0x30
+
+
+def code4(linear):
+    linear, b4 = divmod(linear, 10)
+    linear, b3 = divmod(linear, 126)
+    b1, b2 = divmod(linear, 10)
+    return (b1 + 0x81) << 24 | (b2 + 0x30) << 16 | (b3 + 0x81) << 8 | b4 + 0x30
+
+
+def gb2312_to_unicode(codes, cache=None):
+    table = dense_table('gb2312', cache)
+    if is_ndarray(codes):
+        codes = np_codes(codes)
+        qu, wei = codes // 100, codes % 100
+        ok = (qu > 0) & (qu < 95) & (wei > 0) & (wei < 95)
+        return np_lookup(table, ok, (qu - 1) * 94 + wei - 1)
+    result = array('I')
+    append = result.append
+    for code in codes:
+        qu, wei = divmod(code, 100)
+        p = table[(qu - 1) * 94 + wei - 1] if 0 < qu < 95 and 0 < wei < 95 else 0
+        append(p or EMPTY)
+    return result
+
+
+def gbk_to_unicode(codes, cache=None, name='gbk'):
+    table = dense_table(name, cache)
+    if is_ndarray(codes):
+        codes = np_codes(codes)
+        lead, trail = codes >> 8, codes & 0xff
+        ok = (lead >= 0x81) & (lead <= 0xfe) & (trail >= 0x40) & (trail <= 0xfe)
+        result = np_lookup(table, ok, (lead - 0x81) * 191 + trail - 0x40)
+        ascii = (codes >= 0) & (codes < 0x80)
+        result[ascii] = codes[ascii]
+        return result
+    result = array('I')
+    append = result.append
+    for code in codes:
+        if code < 0x80:
+            append(code if code >= 0 else EMPTY)
+            continue
+        lead, trail = code >> 8, code & 0xff
+        p = table[(lead - 0x81) * 191 + trail - 0x40] if 0x81 <= lead <= 0xfe and 0x40 <= trail <= 0xfe else 0
+        append(p or EMPTY)
+    return result
+
+
+def gb18030_to_unicode_ndarray(codes, cache=None):
+    codes = np_codes(codes)
+    result = gbk_to_unicode(codes, cache, 'gb18030')
+    four = codes > 0xffff
+    if not four.any():
+        return result
+    b1, b2, b3, b4 = codes >> 24, codes >> 16 & 0xff, codes >> 8 & 0xff, codes & 0xff
+    four &= (b2 >= 0x30) & (b2 <= 0x39) & (b3 >= 0x81) & (b3 <= 0xfe) & (b4 >= 0x30) & (b4 <= 0x39)
+    linear = (((b1 - 0x81) * 10 + b2 - 0x30) * 126 + b3 - 0x81) * 10 + b4 - 0x30
+    table = dense_table('gb18030-4', cache)
+    bmp = four & (b1 >= 0x81) & (b1 <= 0x84) & (linear >= 0) & (linear < len(table))
+    result[bmp] = np_lookup(table, bmp, linear)[bmp]
+    supplementary = four & (codes >= GB18030_SUPPLEMENTARY) & (codes <= GB18030_SUPPLEMENTARY_END)
+    result[supplementary] = 0x10000 + linear[supplementary] - linear4(GB18030_SUPPLEMENTARY)
+    return result
+
+
+def gb18030_to_unicode(codes, cache=None):
+    if is_ndarray(codes):
+        return gb18030_to_unicode_ndarray(codes, cache)
+    codes = codes if isinstance(codes, (list, tuple, array)) else list(codes)
+    result = gbk_to_unicode(codes, cache, 'gb18030')
+    table = None
+    start = linear4(GB18030_SUPPLEMENTARY)
+    for x, code in enumerate(codes):
+        if code <= 0xffff:
+            continue
+        if table is None:
+            table = dense_table('gb18030-4', cache)
+        linear = linear4(code)
+        if 0x81 <= code >> 24 <= 0x84 and 0 <= linear < len(table):
+            result[x] = table[linear] or EMPTY
+        elif GB18030_SUPPLEMENTARY <= code <= GB18030_SUPPLEMENTARY_END and linear >= 0:
+            result[x] = 0x10000 + linear - start
+    return result
+
+
+def reverse_table(name, cache=None):
+    # code point of the BMP -> code, the first code of a code point wins
+    key = 'reverse-' + name
+    table = TABLES.get(key)
+    if table is None:
+        table = array('I', [EMPTY]) * 0x10000
+        if name == 'gb2312':
+            for x, p in enumerate(dense_table('gb2312', cache)):
+                if p and table[p] == EMPTY:
+                    table[p] = (x // 94 + 1) * 100 + x % 94 + 1
+        else:
+            table[:0x80] = array('I', range(0x80))
+            for x, p in enumerate(dense_table(name, cache)):
+                if p and table[p] == EMPTY:
+                    table[p] = (x // 191 + 0x81) << 8 | x % 191 + 0x40
+            if name == 'gb18030':
+                for x, p in enumerate(dense_table('gb18030-4', cache)):
+                    if p and table[p] == EMPTY:
+                        table[p] = code4(x)
+        TABLES[key] = table
+    return table
+
+
+def unicode_to(name, points, cache=None):
+    table = reverse_table(name, cache)
+    start = linear4(GB18030_SUPPLEMENTARY)
+    if is_ndarray(points):
+        import numpy as np
+        points = np_codes(points)
+        result = np.full(points.shape, EMPTY, np.uint32)
+        bmp = (points >= 0) & (points <= 0xffff)
+        result[bmp] = np_table(table)[points[bmp]]
+        if name == 'gb18030':
+            other = (points >= 0x10000) & (points <= 0x10ffff)
+            result[other] = code4(start + points[other] - 0x10000)
+        return result
+    result = array('I')
+    append = result.append
+    for p in points:
+        if 0 <= p <= 0xffff:
+            append(table[p])
+        elif name == 'gb18030' and 0x10000 <= p <= 0x10ffff:
+            append(code4(start + p - 0x10000))
+        else:
+            append(EMPTY)
+    return result
+
+
+def unicode_points(points):
+    if is_ndarray(points):
+        import numpy as np
+        points = np_codes(points)
+        return np.where((points >= 0) & (points <= 0x10ffff), points, EMPTY).astype(np.uint32)
+    return array('I', [p if 0 <= p <= 0x10ffff else EMPTY for p in points])
+
+
+def to_unicode(encoding, codes, cache=None):
+    if encoding == 'unicode':
+        return unicode_points(codes)
+    if encoding == 'gb2312':
+        return gb2312_to_unicode(codes, cache)
+    if encoding == 'gbk':
+        return gbk_to_unicode(codes, cache)
+    if encoding == 'gb18030':
+        return gb18030_to_unicode(codes, cache)
+    raise ValueError('unknown encoding: %s' % encoding)
+
+
+def from_unicode(encoding, points, cache=None):
+    if encoding == 'unicode':
+        return unicode_points(points)
+    if encoding not in ENCODINGS:
+        raise ValueError('unknown encoding: %s' % encoding)
+    return unicode_to(encoding, points, cache)
+
+
+def convert(codes, src, dst, cache=None):
+    # codes of src -> codes of dst as an array('I'), or a numpy array for
+    # one, through code points held in an array, no str is made
+    points = to_unicode(src, codes, cache)
+    if dst == 'unicode':
+        return points
+    return from_unicode(dst, points, cache)
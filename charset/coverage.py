@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- encoding:utf-8 -*-
+
+import sys
+from collections import Counter, OrderedDict
+
+from charset import CHARSET_CLASS
+from charset.annotate import iter_text, CHUNK_SIZE
+
+
+BAR_WIDTH = 40
+
+
+def count_chars(path, encoding='utf-8', errors='replace', chunk_size=CHUNK_SIZE):
+    # characters of a file and their counts, read a chunk at a time
+    counter = Counter()
+    if path == '-':
+        fileobj = getattr(sys.stdin, 'buffer', sys.stdin)
+        for text in iter_text(fileobj, encoding, errors, chunk_size):
+            counter.update(text)
+        return counter
+    with open(path, 'rb') as fileobj:
+        for text in iter_text(fileobj, encoding, errors, chunk_size):
+            counter.update(text)
+    return counter
+
+
+def iter_counts(paths, encoding='utf-8', errors='replace', jobs=None):
+    if jobs and jobs > 1 and '-' not in paths:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(jobs) as executor:
+            futures = [executor.submit(count_chars, path, encoding, errors) for path in paths]
+            for path, future in zip(paths, futures):
+                yield path, future.result()
+    else:
+        for path in paths:
+            yield path, count_chars(path, encoding, errors)
+
+
+def charset_coverage(charset, counter):
+    # characters are looked up once for each distinct character
+    total = sum(counter.values())
+    covered = 0
+    categories = Counter()
+    missing = Counter()
+    for ch, count in counter.items():
+        try:
+            ch.encode(charset.encoding)
+        except UnicodeEncodeError:
+            missing[ch] += count
+            continue
+        covered += count
+        try:
+            category = charset.char_category(ch)
+        except UnicodeEncodeError:
+            category = None
+        categories[category or '-'] += count
+    return OrderedDict((
+        ('total', total),
+        ('covered', covered),
+        ('distinct', len(counter)),
+        ('distinct_covered', len(counter) - len(missing)),
+        ('categories', OrderedDict(categories.most_common())),
+        ('missing', OrderedDict(missing.most_common())),
+    ))
+
+
+def coverage(paths, encodings=None, file_encoding='utf-8', errors='replace', jobs=None):
+    counter = Counter()
+    files = 0
+    for path, count in iter_counts(paths, file_encoding, errors, jobs):
+        counter.update(count)
+        files += 1
+    result = OrderedDict((
+        ('files', files),
+        ('chars', sum(counter.values())),
+        ('distinct', len(counter)),
+        ('charsets', OrderedDict()),
+    ))
+    for name in encodings or CHARSET_CLASS.keys():
+        result['charsets'][name] = charset_coverage(CHARSET_CLASS[name](), counter)
+    return result
+
+
+def percent(count, total):
+    return 100.0 * count / total if total else 0.0
+
+
+def format_coverage(result, top=10):
+    lines = []
+    lines.append('Files: %s, chars: %s, distinct: %s' % (
+        result['files'], result['chars'], result['distinct']))
+    for name, item in result['charsets'].items():
+        lines.append('')
+        lines.append('%s: %.2f%% (%s of %s), distinct %s of %s' % (
+            name.upper(), percent(item['covered'], item['total']),
+            item['covered'], item['total'],
+            item['distinct_covered'], item['distinct'],
+        ))
+        for category, count in item['categories'].items():
+            p = percent(count, item['total'])
+            lines.append('  %-36s %10d %6.2f%% %s' % (
+                category, count, p, '#' * int(round(p * BAR_WIDTH / 100))))
+        if item['missing'] and top:
+            missing = list(item['missing'].items())[:top]
+            lines.append('  missing: %s' % ' '.join(
+                ['%s(U+%04X)x%s' % (ch, ord(ch), count) for ch, count in missing]))
+    return '\n'.join(lines)
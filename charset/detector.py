@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- encoding:utf-8 -*-
+
+import codecs
+from collections import OrderedDict
+
+from charset import CHARSET_CLASS
+
+
+# narrower charsets first, they win a tie
+DETECT_ENCODINGS = ('utf8', 'gb2312', 'gbk', 'gb18030')
+
+CHUNK_SIZE = 1 << 20
+
+# a charset with this many more invalid bytes per byte than the best one is
+# not scanned any further
+PRUNE_RATIO = 0.01
+PRUNE_MIN = 64
+
+
+class Scanner(object):
+    # invalid byte sequences of a charset counted by its codec, the codec
+    # checks the byte ranges of the charset in C. The incremental decoder
+    # keeps a sequence cut at the end of a chunk.
+    def __init__(self, charset):
+        self.encoding = charset.encoding
+        self.decoder = codecs.getincrementaldecoder(self.encoding)(errors='replace')
+        self.size = 0
+        self.invalid = 0
+
+    def feed(self, data, final=False):
+        text = self.decoder.decode(data, final=final)
+        self.size += len(data)
+        self.invalid += text.count(u'\ufffd')
+
+    def score(self):
+        if not self.size:
+            return 1.0
+        return 1.0 - float(self.invalid) / self.size
+
+
+class Detector(object):
+    # feed bytes as they come, every charset scans them in one pass
+    def __init__(self, encodings=None):
+        self.scanners = OrderedDict()
+        for name in encodings or DETECT_ENCODINGS:
+            self.scanners[name] = Scanner(CHARSET_CLASS[name]())
+        self.active = list(self.scanners.keys())
+        self.size = 0
+        self.ascii = True
+        self.done = False
+
+    def feed(self, data, final=False):
+        self.size += len(data)
+        if self.ascii and data.isascii():
+            return
+        if self.ascii:
+            # ASCII is valid in all of them, nothing to count before
+            self.ascii = False
+            for scanner in self.scanners.values():
+                scanner.size = self.size - len(data)
+        for name in self.active:
+            self.scanners[name].feed(data, final)
+        best = min([self.scanners[name].invalid for name in self.active])
+        limit = best + max(PRUNE_MIN, self.size * PRUNE_RATIO)
+        self.active = [name for name in self.active if self.scanners[name].invalid <= limit]
+        if final:
+            self.done = True
+
+    def close(self):
+        if not self.done:
+            self.feed(b'', final=True)
+        return self.result()
+
+    def result(self):
+        if self.ascii:
+            return OrderedDict((
+                ('encoding', 'ascii' if self.size else None),
+                ('confidence', 1.0 if self.size else 0.0),
+                ('scores', OrderedDict((name, 1.0) for name in self.scanners)),
+            ))
+        scores = OrderedDict()
+        for name, scanner in self.scanners.items():
+            scores[name] = scanner.score() if name in self.active else 0.0
+        best = max(scores, key=lambda x: scores[x])
+        return OrderedDict((
+            ('encoding', best),
+            ('confidence', scores[best]),
+            ('scores', scores),
+        ))
+
+
+def detect(data, encodings=None, chunk_size=CHUNK_SIZE):
+    # data is bytes or a binary file object
+    detector = Detector(encodings)
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data)
+        for x in range(0, len(data), chunk_size):
+            detector.feed(data[x:x + chunk_size])
+        return detector.close()
+    while True:
+        chunk = data.read(chunk_size)
+        if not chunk:
+            break
+        detector.feed(chunk)
+    return detector.close()
@@ -4,6 +4,7 @@
 import struct
 
 from .base import CharsetBase
+from .index import BoxIndex
 
 
 class GB2312(CharsetBase):
@@ -21,6 +22,7 @@ class GB2312(CharsetBase):
     sec_desc = u'区'
     pos_desc = u'位'
     encoding = 'gb2312'
+    code_size = 2
     offset = 0xa0
     define = {
         'panel0': {
@@ -58,35 +60,22 @@ class GB2312(CharsetBase):
         ],
     }
 
-    def __init__(self, errors=None):
-        super(GB2312, self).__init__(errors=errors)
-
-    def get_category(self, b_code):
-        code, = struct.unpack('>H', b_code)
-        f = (code >> 8 & 0xff) - self.offset
-        s = (code & 0xff) - self.offset
-        for k, v in self.category.items():
-            for vv in v:
-                for f1, f2, s1, s2 in vv['range']:
-                    if f1 <= f <= f2 and s1 <= s <= s2:
-                        return vv['name']
-        return None
-
-    def chars(self, codes):
-        chars = []
-        for code in codes:
-            b_code = struct.pack('>2B', int(code[:2]) + 0xa0, int(code[2:]) + 0xa0)
-            ch = b_code.decode(self.encoding)
-            chars.append(ch)
-        return chars
-
-    def codes(self, chars):
-        codes = []
-        for ch in chars:
-            b_code = ch.encode(self.encoding)
-            code = ''.join(['%02d' % (x - self.offset) for x in struct.unpack('>2B', b_code)])
-            codes.append(code)
-        return codes
+    def __init__(self, errors=None, cache=None):
+        super(GB2312, self).__init__(errors=errors, cache=cache)
+
+    @classmethod
+    def build_category_index(cls):
+        return BoxIndex(cls.category, offset=cls.offset)
+
+    def code_ranges(self, rng):
+        x1, x2, y1, y2 = rng
+        return [(x1 + self.offset, x2 + self.offset), (y1 + self.offset, y2 + self.offset)]
+
+    def code_bytes(self, code):
+        return struct.pack('>2B', int(code[:2]) + self.offset, int(code[2:]) + self.offset)
+
+    def format_code(self, b_code):
+        return ''.join(['%02d' % (x - self.offset) for x in struct.unpack('>2B', b_code)])
 
     def as_txt(self, errors=None):
         err_ch = errors if errors else ''
@@ -99,53 +88,28 @@ class GB2312(CharsetBase):
         lines.append('')
         lines.append(' ' * 6 + ' '.join(['%02X' % (self.offset + x + 1) for x in range(94)]))
         lines.append(' ' * 6 + ' '.join(['%02d' % (x + 1) for x in range(94)]))
+        chars = self.code_table(self.define['panel0']).chars(err_ch=err_ch)
         for x in range(94):
             sec = x + 1
             row = []
             row.append('%02X' % (sec + self.offset))
             row.append('%02d' % sec)
-            for y in range(94):
-                pos = y + 1
-                b_code = struct.pack('>2B', sec + self.offset, pos + self.offset)
-                ch = b_code.decode(self.encoding, errors='ignore')
-                if not ch:
-                    ch = err_ch
-                row.append(ch)
+            row += chars[x * 94:(x + 1) * 94]
             lines.append(' '.join(row))
         return '\n'.join(lines)
 
-    def do_panel_as_html(self, define, err_ch):
-        html = []
+    def do_panel_as_html(self, define, err_ch, collapse=False):
+        cells = self.code_table(define).cells(err_ch)
         x1, x2, y1, y2 = define['range']
-        html.append('<table>')
-        html.append(
-            '<tr>' +
-            '<td colspan="2" rowspan="2">%s\%s</td>' % (self.sec_desc, self.pos_desc) +
-            ''.join(['<td>%02X</td>' % (self.offset + x) for x in range(y1, y2 + 1)]) +
-            '</tr>'
-        )
-        html.append(
-            '<tr>' +
-            ''.join(['<td>%02d</td>' % x for x in range(y1, y2 + 1)]) +
-            '</tr>'
-        )
-        for sec in range(x1, x2 + 1):
-            row = []
-            row.append('<td>%02X</td>' % (sec + self.offset))
-            row.append('<td>%02d</td>' % sec)
-            for pos in range(y1, y2 + 1):
-                b_code = struct.pack('>2B', sec + self.offset, pos + self.offset)
-                ch = b_code.decode(self.encoding, errors='ignore')
-                if not ch:
-                    ch = err_ch
-                name = self.get_category(b_code)
-                if name:
-                    row.append('<td class="%s">%s</td>' % (name, ch))
-                else:
-                    row.append('<td>%s</td>' % ch)
-            html.append('<tr>' + ''.join(row) + '</tr>')
-        html.append('</table>')
-        return html
+        header = [
+            self.header_row(
+                ['%02X' % (self.offset + x) for x in range(y1, y2 + 1)],
+                '<td colspan="2" rowspan="2">%s\%s</td>' % (self.sec_desc, self.pos_desc),
+            ),
+            self.header_row(['%02d' % x for x in range(y1, y2 + 1)], ''),
+        ]
+        labels = ['<td>%02X</td><td>%02d</td>' % (sec + self.offset, sec) for sec in range(x1, x2 + 1)]
+        return self.table_as_html(cells, header, labels, y2 - y1 + 1, collapse=collapse)
 
     def as_rst(self, errors=None):
         err_ch = errors if errors else ''
@@ -159,14 +123,7 @@ class GB2312(CharsetBase):
         lines.append('wiki: %s' % self.wiki)
         lines.append('')
 
-        chars = []
-        for x in range(1, 95):
-            for y in range(1, 95):
-                b_code = struct.pack('>2B', x + self.offset, y + self.offset)
-                ch = b_code.decode(self.encoding, errors='ignore')
-                if not ch:
-                    ch = err_ch
-                chars.append(ch)
+        chars = self.code_table(self.define['panel0']).chars(err_ch=err_ch)
         data = []
         data.append(['', ''] + ['%02X' % (x + 1 + 0xa0) for x in range(94)])
         data.append(['', ''] + ['%02d' % (x + 1) for x in range(94)])
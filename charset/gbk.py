@@ -1,8 +1,6 @@
 #!/usr/bin/env python
 # -*- encoding:utf-8 -*-
 
-import struct
-
 from .base import CharsetBase
 
 
@@ -28,6 +26,7 @@ class GBK(CharsetBase):
     wiki = 'https://zh.wikipedia.org/wiki/GBK'
 
     encoding = 'gbk'
+    code_size = 2
     define = {
         'panel0': {
             'desc': ['ASCII', 'One Byte'],
@@ -95,83 +94,32 @@ class GBK(CharsetBase):
         ],
     }
 
-    def __init__(self, errors=None):
-        super(GBK, self).__init__(errors=errors)
-
-    def get_category(self, b_code):
-        code, = struct.unpack('>H', b_code)
-        f = code >> 8
-        s = code & 0xff
-        for k, v in self.category.items():
-            for vv in v:
-                for f1, f2, s1, s2 in vv['range']:
-                    if f1 <= f <= f2 and s1 <= s <= s2:
-                        return vv['name']
-        return None
+    def __init__(self, errors=None, cache=None):
+        super(GBK, self).__init__(errors=errors, cache=cache)
 
-    def do_panel_as_html(self, define, err_ch):
+    def do_panel_as_html(self, define, err_ch, collapse=False):
         x1, x2, y1, y2 = define['range']
         if x1 == x2 == 0x0:
-            return self.panel_as_html_1B(define, err_ch)
+            return self.panel_as_html_1B(define, err_ch, collapse)
         else:
-            return self.panel_as_html_2B(define, err_ch)
+            return self.panel_as_html_2B(define, err_ch, collapse)
         return []
 
-    def panel_as_html_1B(self, define, err_ch):
-        html = []
+    def panel_as_html_1B(self, define, err_ch, collapse=False):
+        cells = self.code_table(define).cells(err_ch)
         x1, x2, y1, y2 = define['range']
         x1, x2 = (y1 >> 4 & 0xf, y2 >> 4 & 0xf)
         y1, y2 = (y1 & 0xf, y2 & 0xf)
-        html.append('<table>')
-        html.append(
-            '<tr>' +
-            '<td></td>' +
-            ''.join(['<td>%02X</td>' % y for y in range(y1, y2 + 1)]) +
-            '</tr>'
-        )
-        for x in range(x1, x2 + 1):
-            row = []
-            row.append('<td>%02X</td>' % x)
-            for y in range(y1, y2 + 1):
-                b_code = struct.pack('>B', x << 4 | y)
-                ch = b_code.decode(self.encoding, errors='ignore')
-                if not ch:
-                    ch = err_ch
-                name = self.get_category(b'\x00' + b_code)
-                if name:
-                    row.append('<td class="%s">%s</td>' % (name, ch))
-                else:
-                    row.append('<td>%s</td>' % ch)
-            html.append('<tr>' + ''.join(row) + '</tr>')
-        html.append('</table>')
-        return html
+        header = [self.header_row(['%02X' % y for y in range(y1, y2 + 1)])]
+        labels = ['<td>%02X</td>' % x for x in range(x1, x2 + 1)]
+        return self.table_as_html(cells, header, labels, y2 - y1 + 1, b'\x00', collapse=collapse)
 
-    def panel_as_html_2B(self, define, err_ch):
-        html = []
+    def panel_as_html_2B(self, define, err_ch, collapse=False):
+        cells = self.code_table(define).cells(err_ch)
         x1, x2, y1, y2 = define['range']
-        html.append('<table>')
-        html.append(
-            '<tr>' +
-            '<td></td>' +
-            ''.join(['<td>%02X</td>' % y for y in range(y1, y2 + 1)]) +
-            '</tr>'
-        )
-        for x in range(x1, x2 + 1):
-            row = []
-            row.append('<td>%02X</td>' % x)
-            for y in range(y1, y2 + 1):
-                b_code = struct.pack('>2B', x, y)
-                ch = b_code.decode(self.encoding, errors='ignore')
-                if not ch:
-                    ch = err_ch
-                name = self.get_category(b_code)
-                if name:
-                    row.append('<td class="%s">%s</td>' % (name, ch))
-                else:
-                    row.append('<td>%s</td>' % ch)
-            html.append('<tr>' + ''.join(row) + '</tr>')
-        html.append('</table>')
-        return html
+        header = [self.header_row(['%02X' % y for y in range(y1, y2 + 1)])]
+        labels = ['<td>%02X</td>' % x for x in range(x1, x2 + 1)]
+        return self.table_as_html(cells, header, labels, y2 - y1 + 1, collapse=collapse)
 
 
 if __name__ == '__main__':
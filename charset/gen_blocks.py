@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- encoding:utf-8 -*-
+
+import os
+import re
+import sys
+import argparse
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+BLOCKS_TXT = os.path.join(DATA_DIR, 'Blocks.txt')
+BLOCKS_PY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'unicode_blocks.py')
+
+HEADER = '''#!/usr/bin/env python
+# -*- encoding:utf-8 -*-
+# generated by "python -m charset.gen_blocks" from %s, do not edit
+
+from array import array
+
+version = '%s'
+
+'''
+
+FOOTER = '''
+starts = array('I', [x[0] for x in blocks])
+ends = array('I', [x[1] for x in blocks])
+names = tuple([x[2] for x in blocks])
+'''
+
+
+def read_blocks(fileobj):
+    # (start, end, name) of "0000..007F; Basic Latin" lines, the name is
+    # written with "_" like names of unicode_category
+    version = None
+    blocks = []
+    for line in fileobj:
+        line = line.strip()
+        if not version:
+            m = re.match(r'#\s*Blocks-(\S+)\.txt', line)
+            if m:
+                version = m.group(1)
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        rng, name = line.split(';')
+        start, end = rng.split('..')
+        blocks.append((int(start, 16), int(end, 16), name.strip().replace(' ', '_')))
+    blocks.sort()
+    return version, blocks
+
+
+def write_module(fileobj, version, blocks, source='Blocks.txt'):
+    fileobj.write(HEADER % (source, version))
+    fileobj.write('blocks = (\n')
+    for start, end, name in blocks:
+        fileobj.write("(0x%04X, 0x%04X, '%s'),\n" % (start, end, name))
+    fileobj.write(')\n')
+    fileobj.write(FOOTER)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='python -m charset.gen_blocks',
+        description='Generate unicode_blocks.py from Unicode Blocks.txt',
+    )
+    parser.add_argument(
+        'blocks',
+        nargs='?',
+        default=BLOCKS_TXT,
+        help='Blocks.txt of Unicode Character Database. default: %s' % BLOCKS_TXT
+    )
+    parser.add_argument(
+        'output',
+        nargs='?',
+        default=BLOCKS_PY,
+        help='output module. default: %s' % BLOCKS_PY
+    )
+    args = parser.parse_args()
+
+    with open(args.blocks, encoding='utf-8') as f:
+        version, blocks = read_blocks(f)
+    for x in range(1, len(blocks)):
+        if blocks[x][0] <= blocks[x - 1][1]:
+            print('Overlapped block: %s, %s' % (blocks[x - 1][2], blocks[x][2]))
+            return 1
+    source = 'Blocks-%s.txt' % version if version else os.path.basename(args.blocks)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        write_module(f, version, blocks, source)
+    print('%s blocks of Unicode %s: %s' % (len(blocks), version, args.output))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
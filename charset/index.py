@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- encoding:utf-8 -*-
+
+from bisect import bisect_right
+
+
+class BoxIndex(object):
+    # category range is a box, a (low, high) pair per byte. Each byte value
+    # maps to a bit mask of the boxes accepting it, the lowest bit is the
+    # first matched range in category order. Two bytes are looked up at once
+    # in a flat table of 65536 masks.
+    def __init__(self, category, offset=0):
+        self.names = []
+        masks = []
+        for k, v in category.items():
+            for vv in v:
+                for rng in vv['range']:
+                    pairs = list(zip(rng[::2], rng[1::2]))
+                    if not masks:
+                        masks = [[0] * 256 for x in pairs]
+                    bit = 1 << len(self.names)
+                    self.names.append(vv['name'])
+                    for mask, (lo, hi) in zip(masks, pairs):
+                        for x in range(max(lo + offset, 0), min(hi + offset, 0xff) + 1):
+                            mask[x] |= bit
+        self.width = len(masks)
+        self.tables = []
+        for x in range(0, self.width, 2):
+            if x + 1 < self.width:
+                self.tables.append([h & l for h in masks[x] for l in masks[x + 1]])
+            else:
+                self.tables.append(masks[x])
+        if self.width == 2:
+            self.flat = [self.first(m) for m in self.tables[0]]
+
+    def first(self, found):
+        if not found:
+            return None
+        return self.names[(found & -found).bit_length() - 1]
+
+    def lookup(self, b_code):
+        if len(b_code) != self.width:
+            return None
+        if self.width == 2:
+            return self.flat[b_code[0] << 8 | b_code[1]]
+        if self.width == 4:
+            t1, t2 = self.tables
+            return self.first(t1[b_code[0] << 8 | b_code[1]] & t2[b_code[2] << 8 | b_code[3]])
+        found = -1
+        for x, table in enumerate(self.tables):
+            if x * 2 + 1 < self.width:
+                found &= table[b_code[x * 2] << 8 | b_code[x * 2 + 1]]
+            else:
+                found &= table[b_code[x * 2]]
+        return self.first(found)
+
+
+class IntervalIndex(object):
+    # category range is a (start, end) interval of code point, no overlap.
+    # Kept in parallel tuples, they are shared read-only and bisect is
+    # faster on a tuple than on an array.
+    def __init__(self, category):
+        items = sorted(
+            (vv['range'][0], vv['range'][1], vv['name'])
+            for v in category.values() for vv in v
+        )
+        self.starts = tuple([x[0] for x in items])
+        self.ends = tuple([x[1] for x in items])
+        self.names = tuple([x[2] for x in items])
+
+    def lookup(self, code):
+        x = bisect_right(self.starts, code) - 1
+        if x >= 0 and code <= self.ends[x]:
+            return self.names[x]
+        return None
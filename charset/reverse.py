@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- encoding:utf-8 -*-
+
+import unicodedata
+from array import array
+from bisect import bisect_left
+from itertools import compress
+from collections import OrderedDict
+
+from charset import CHARSET_CLASS
+from charset.codetable import EMPTY
+
+
+# inputs of up to this many distinct characters are looked up by encoding
+# them, building the index takes seconds without a cache
+DIRECT_CHARS = 256
+
+
+def index_key(names):
+    return 'reverse-' + '-'.join(names)
+
+
+class ReverseIndex(object):
+    # code of every charset for a code point. Code points with a code in any
+    # charset are kept sorted in one array, each charset has an array of
+    # codes beside it with EMPTY for a missing code. The arrays are built
+    # from the valid codes of the panel code tables.
+    def __init__(self, encodings=None, cache=None):
+        self.charsets = OrderedDict()
+        for name in encodings or CHARSET_CLASS.keys():
+            self.charsets[name] = CHARSET_CLASS[name](cache=cache)
+        key = index_key(self.charsets.keys())
+        data = cache.load(key, (), None) if cache else None
+        if data is None:
+            data = self.build()
+            if cache:
+                cache.store(key, (), data)
+        # points followed by codes of each charset
+        count = len(data) // (len(self.charsets) + 1)
+        self.points = data[:count]
+        self.codes = OrderedDict()
+        for x, name in enumerate(self.charsets.keys(), 1):
+            self.codes[name] = data[x * count:(x + 1) * count]
+
+    def build(self):
+        found = OrderedDict()
+        for name, charset in self.charsets.items():
+            found[name] = self.table_codes(charset)
+        points = set()
+        for codes in found.values():
+            points.update(codes)
+        points = sorted(points)
+        data = array('I', points)
+        for codes in found.values():
+            get = codes.get
+            data.extend([get(p, EMPTY) for p in points])
+        return data
+
+    def __len__(self):
+        return len(self.points)
+
+    def table_codes(self, charset):
+        # code point -> code as int, the first code wins
+        codes = {}
+        for key in sorted(charset.define, key=lambda x: int(x[5:])):
+            table = charset.code_table(charset.define[key])
+            w = table.width
+            buf = table.buffer
+            for x in compress(range(len(table)), table.validity()):
+                codes.setdefault(table.points[x], int.from_bytes(buf[x * w:(x + 1) * w], 'big'))
+        return codes
+
+    def find(self, ch):
+        p = ord(ch)
+        x = bisect_left(self.points, p)
+        if x < len(self.points) and self.points[x] == p:
+            return x
+        return None
+
+    def format_code(self, name, code):
+        if code == EMPTY:
+            return None
+        charset = self.charsets[name]
+        return charset.format_code(code.to_bytes(charset.code_size, 'big'))
+
+    def lookup(self, ch):
+        # encoding -> code of one character, None for a missing code
+        x = self.find(ch)
+        result = OrderedDict()
+        for name, codes in self.codes.items():
+            result[name] = None if x is None else self.format_code(name, codes[x])
+        return result
+
+    def codes_of(self, chars):
+        # encoding -> codes of chars, each distinct character is looked up
+        # once
+        found = dict((ch, self.find(ch)) for ch in set(chars))
+        result = OrderedDict()
+        for name, codes in self.codes.items():
+            formatted = dict(
+                (ch, None if x is None else self.format_code(name, codes[x]))
+                for ch, x in found.items()
+            )
+            result[name] = [formatted[ch] for ch in chars]
+        return result
+
+
+def direct_codes(charset, chars):
+    # codes of chars in one charset like ReverseIndex, by encoding each
+    # distinct character. A code counts when it is in a panel and decodes
+    # back to an assigned character.
+    panels = [charset.code_ranges(define['range']) for define in charset.define.values()]
+    found = {}
+    for ch in set(chars):
+        try:
+            b_code = ch.encode(charset.encoding)
+            valid = b_code.decode(charset.encoding) == ch and unicodedata.category(ch) != 'Cn'
+        except UnicodeError:
+            valid = False
+        if valid and any(
+            len(b_code) == len(ranges) and all(lo <= b <= hi for b, (lo, hi) in zip(b_code, ranges))
+            for ranges in panels
+        ):
+            found[ch] = charset.format_code(b_code.rjust(charset.code_size, b'\x00'))
+        else:
+            found[ch] = None
+    return [found[ch] for ch in chars]
+
+
+def codes_of(chars, encodings=None, cache=None):
+    # encoding -> codes of chars in every charset. The reverse index is
+    # used for large inputs or when it is cached already.
+    names = list(encodings or CHARSET_CLASS.keys())
+    if len(set(chars)) > DIRECT_CHARS or (cache and cache.load(index_key(names), (), None) is not None):
+        return ReverseIndex(names, cache=cache).codes_of(chars)
+    result = OrderedDict()
+    for name in names:
+        result[name] = direct_codes(CHARSET_CLASS[name](cache=cache), chars)
+    return result
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+# -*- encoding:utf-8 -*-
+
+import re
+import html
+import json
+import time
+import struct
+import threading
+import traceback
+from collections import OrderedDict, deque
+from urllib.parse import urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from charset import version, CHARSET_CLASS
+from charset.annotate import annotation
+
+
+PANEL_PATH = re.compile(r'^/panel/(\w+)/(\d+)\.html$')
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class BadRequest(Exception):
+    pass
+
+
+class Metrics(object):
+    # request count and latency of each endpoint, quantiles are taken from
+    # the latest samples
+    def __init__(self, samples=1024):
+        self.samples = samples
+        self.lock = threading.Lock()
+        self.endpoints = OrderedDict()
+
+    def record(self, endpoint, status, seconds):
+        with self.lock:
+            item = self.endpoints.get(endpoint)
+            if item is None:
+                item = self.endpoints[endpoint] = {
+                    'count': 0,
+                    'errors': 0,
+                    'sum': 0.0,
+                    'max': 0.0,
+                    'latest': deque(maxlen=self.samples),
+                }
+            item['count'] += 1
+            if status >= 400:
+                item['errors'] += 1
+            item['sum'] += seconds
+            item['max'] = max(item['max'], seconds)
+            item['latest'].append(seconds)
+
+    def as_text(self):
+        lines = []
+        with self.lock:
+            for endpoint, item in self.endpoints.items():
+                label = 'endpoint="%s"' % endpoint
+                lines.append('charset_requests_total{%s} %d' % (label, item['count']))
+                lines.append('charset_request_errors_total{%s} %d' % (label, item['errors']))
+                lines.append('charset_request_seconds_sum{%s} %.6f' % (label, item['sum']))
+                lines.append('charset_request_seconds_max{%s} %.6f' % (label, item['max']))
+                latest = sorted(item['latest'])
+                for q in QUANTILES:
+                    lines.append('charset_request_seconds{%s,quantile="%s"} %.6f' % (
+                        label, q, latest[min(int(len(latest) * q), len(latest) - 1)]))
+        return '\n'.join(lines) + '\n'
+
+
+class CharsetHandler(BaseHTTPRequestHandler):
+    server_version = 'charset/' + version
+
+    def do_GET(self):
+        start = time.perf_counter()
+        url = urlsplit(self.path)
+        query = dict((k, v[-1]) for k, v in parse_qs(url.query).items())
+        m = PANEL_PATH.match(url.path)
+        if m:
+            endpoint = '/panel'
+            handler = self.send_panel
+            args = m.groups() + (query,)
+        elif url.path in self.server.routes:
+            endpoint = url.path
+            handler = getattr(self, self.server.routes[url.path])
+            args = (query,)
+        else:
+            endpoint = 'other'
+            handler = self.send_not_found
+            args = (query,)
+        self.response_status = None
+        status = 500
+        try:
+            status = handler(*args)
+        except BadRequest as err:
+            status = self.send_json({'error': str(err)}, 400)
+        except Exception:
+            # a failed request is answered with 500, or ends the response
+            # already being sent by closing the connection
+            self.log_error('error on %s\n%s', self.path, traceback.format_exc())
+            status = 500
+            self.close_connection = True
+            if self.response_status is None:
+                self.send_json({'error': 'internal error'}, 500)
+        finally:
+            self.server.metrics.record(endpoint, status, time.perf_counter() - start)
+
+    def send_response(self, code, message=None):
+        self.response_status = code
+        BaseHTTPRequestHandler.send_response(self, code, message)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            BaseHTTPRequestHandler.log_message(self, format, *args)
+
+    def get_charset(self, encoding):
+        charset = self.server.charsets.get(encoding)
+        if charset is None:
+            raise BadRequest('unknown encoding: %s' % encoding)
+        return charset
+
+    def get_param(self, query, name):
+        value = query.get(name)
+        if not value:
+            raise BadRequest('missing parameter: %s' % name)
+        return value
+
+    def send_body(self, body, content_type, status=200):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        return status
+
+    def send_json(self, data, status=200):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        return self.send_body(body, 'application/json; charset=utf-8', status)
+
+    def send_not_found(self, query):
+        return self.send_json({'error': 'not found'}, 404)
+
+    def send_codes(self, query):
+        encoding = self.get_param(query, 'encoding')
+        charset = self.get_charset(encoding)
+        chars = self.get_param(query, 'chars')
+        try:
+            codes = charset.codes(chars)
+        except (UnicodeEncodeError, struct.error) as err:
+            raise BadRequest(str(err))
+        return self.send_json({'encoding': encoding, 'codes': codes})
+
+    def send_chars(self, query):
+        encoding = self.get_param(query, 'encoding')
+        charset = self.get_charset(encoding)
+        codes = self.get_param(query, 'codes').split(',')
+        try:
+            chars = charset.chars(codes)
+        except (ValueError, struct.error) as err:
+            raise BadRequest(str(err))
+        return self.send_json({'encoding': encoding, 'chars': chars})
+
+    def send_category(self, query):
+        encoding = self.get_param(query, 'encoding')
+        charset = self.get_charset(encoding)
+        items = []
+        for ch in self.get_param(query, 'chars'):
+            code, category = annotation(charset, ch)
+            items.append({'char': ch, 'code': code, 'category': category})
+        return self.send_json({'encoding': encoding, 'items': items})
+
+    def send_metrics(self, query):
+        body = self.server.metrics.as_text().encode('utf-8')
+        return self.send_body(body, 'text/plain; version=0.0.4; charset=utf-8')
+
+    def send_panel(self, encoding, panel, query):
+        charset = self.get_charset(encoding)
+        if 'panel' + panel not in charset.define:
+            return self.send_json({'error': 'unknown panel: %s' % panel}, 404)
+        # the page is written while it is rendered, the end of the page is
+        # marked by closing the connection
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        chunk = []
+        size = 0
+        # the errors text is put into every empty cell of the page
+        errors = html.escape(query.get('errors') or '')
+        lines = charset.iter_html(
+            panels=[panel], errors=errors, collapse=bool(query.get('collapse')))
+        for line in lines:
+            chunk.append(line)
+            size += len(line)
+            if size > 1 << 16:
+                self.wfile.write('\n'.join(chunk).encode('utf-8') + b'\n')
+                chunk = []
+                size = 0
+        self.wfile.write('\n'.join(chunk).encode('utf-8'))
+        return 200
+
+
+class CharsetServer(ThreadingHTTPServer):
+    # one instance of every charset is shared by all requests, category
+    # indexes and code tables are built once and stay in memory
+    daemon_threads = True
+    routes = {
+        '/codes': 'send_codes',
+        '/chars': 'send_chars',
+        '/category': 'send_category',
+        '/metrics': 'send_metrics',
+    }
+
+    def __init__(self, address, cache=None, quiet=False):
+        ThreadingHTTPServer.__init__(self, address, CharsetHandler)
+        self.quiet = quiet
+        self.metrics = Metrics()
+        self.charsets = OrderedDict()
+        for name, cls in CHARSET_CLASS.items():
+            charset = cls(cache=cache)
+            charset.category_index()
+            self.charsets[name] = charset
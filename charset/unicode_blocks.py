@@ -0,0 +1,334 @@
+#!/usr/bin/env python
+# -*- encoding:utf-8 -*-
+# generated by "python -m charset.gen_blocks" from Blocks-14.0.0.txt, do not edit
+
+from array import array
+
+version = '14.0.0'
+
+blocks = (
+(0x0000, 0x007F, 'Basic_Latin'),
+(0x0080, 0x00FF, 'Latin-1_Supplement'),
+(0x0100, 0x017F, 'Latin_Extended-A'),
+(0x0180, 0x024F, 'Latin_Extended-B'),
+(0x0250, 0x02AF, 'IPA_Extensions'),
+(0x02B0, 0x02FF, 'Spacing_Modifier_Letters'),
+(0x0300, 0x036F, 'Combining_Diacritical_Marks'),
+(0x0370, 0x03FF, 'Greek_and_Coptic'),
+(0x0400, 0x04FF, 'Cyrillic'),
+(0x0500, 0x052F, 'Cyrillic_Supplement'),
+(0x0530, 0x058F, 'Armenian'),
+(0x0590, 0x05FF, 'Hebrew'),
+(0x0600, 0x06FF, 'Arabic'),
+(0x0700, 0x074F, 'Syriac'),
+(0x0750, 0x077F, 'Arabic_Supplement'),
+(0x0780, 0x07BF, 'Thaana'),
+(0x07C0, 0x07FF, 'NKo'),
+(0x0800, 0x083F, 'Samaritan'),
+(0x0840, 0x085F, 'Mandaic'),
+(0x0860, 0x086F, 'Syriac_Supplement'),
+(0x0870, 0x089F, 'Arabic_Extended-B'),
+(0x08A0, 0x08FF, 'Arabic_Extended-A'),
+(0x0900, 0x097F, 'Devanagari'),
+(0x0980, 0x09FF, 'Bengali'),
+(0x0A00, 0x0A7F, 'Gurmukhi'),
+(0x0A80, 0x0AFF, 'Gujarati'),
+(0x0B00, 0x0B7F, 'Oriya'),
+(0x0B80, 0x0BFF, 'Tamil'),
+(0x0C00, 0x0C7F, 'Telugu'),
+(0x0C80, 0x0CFF, 'Kannada'),
+(0x0D00, 0x0D7F, 'Malayalam'),
+(0x0D80, 0x0DFF, 'Sinhala'),
+(0x0E00, 0x0E7F, 'Thai'),
+(0x0E80, 0x0EFF, 'Lao'),
+(0x0F00, 0x0FFF, 'Tibetan'),
+(0x1000, 0x109F, 'Myanmar'),
+(0x10A0, 0x10FF, 'Georgian'),
+(0x1100, 0x11FF, 'Hangul_Jamo'),
+(0x1200, 0x137F, 'Ethiopic'),
+(0x1380, 0x139F, 'Ethiopic_Supplement'),
+(0x13A0, 0x13FF, 'Cherokee'),
+(0x1400, 0x167F, 'Unified_Canadian_Aboriginal_Syllabics'),
+(0x1680, 0x169F, 'Ogham'),
+(0x16A0, 0x16FF, 'Runic'),
+(0x1700, 0x171F, 'Tagalog'),
+(0x1720, 0x173F, 'Hanunoo'),
+(0x1740, 0x175F, 'Buhid'),
+(0x1760, 0x177F, 'Tagbanwa'),
+(0x1780, 0x17FF, 'Khmer'),
+(0x1800, 0x18AF, 'Mongolian'),
+(0x18B0, 0x18FF, 'Unified_Canadian_Aboriginal_Syllabics_Extended'),
+(0x1900, 0x194F, 'Limbu'),
+(0x1950, 0x197F, 'Tai_Le'),
+(0x1980, 0x19DF, 'New_Tai_Lue'),
+(0x19E0, 0x19FF, 'Khmer_Symbols'),
+(0x1A00, 0x1A1F, 'Buginese'),
+(0x1A20, 0x1AAF, 'Tai_Tham'),
+(0x1AB0, 0x1AFF, 'Combining_Diacritical_Marks_Extended'),
+(0x1B00, 0x1B7F, 'Balinese'),
+(0x1B80, 0x1BBF, 'Sundanese'),
+(0x1BC0, 0x1BFF, 'Batak'),
+(0x1C00, 0x1C4F, 'Lepcha'),
+(0x1C50, 0x1C7F, 'Ol_Chiki'),
+(0x1C80, 0x1C8F, 'Cyrillic_Extended-C'),
+(0x1C90, 0x1CBF, 'Georgian_Extended'),
+(0x1CC0, 0x1CCF, 'Sundanese_Supplement'),
+(0x1CD0, 0x1CFF, 'Vedic_Extensions'),
+(0x1D00, 0x1D7F, 'Phonetic_Extensions'),
+(0x1D80, 0x1DBF, 'Phonetic_Extensions_Supplement'),
+(0x1DC0, 0x1DFF, 'Combining_Diacritical_Marks_Supplement'),
+(0x1E00, 0x1EFF, 'Latin_Extended_Additional'),
+(0x1F00, 0x1FFF, 'Greek_Extended'),
+(0x2000, 0x206F, 'General_Punctuation'),
+(0x2070, 0x209F, 'Superscripts_and_Subscripts'),
+(0x20A0, 0x20CF, 'Currency_Symbols'),
+(0x20D0, 0x20FF, 'Combining_Diacritical_Marks_for_Symbols'),
+(0x2100, 0x214F, 'Letterlike_Symbols'),
+(0x2150, 0x218F, 'Number_Forms'),
+(0x2190, 0x21FF, 'Arrows'),
+(0x2200, 0x22FF, 'Mathematical_Operators'),
+(0x2300, 0x23FF, 'Miscellaneous_Technical'),
+(0x2400, 0x243F, 'Control_Pictures'),
+(0x2440, 0x245F, 'Optical_Character_Recognition'),
+(0x2460, 0x24FF, 'Enclosed_Alphanumerics'),
+(0x2500, 0x257F, 'Box_Drawing'),
+(0x2580, 0x259F, 'Block_Elements'),
+(0x25A0, 0x25FF, 'Geometric_Shapes'),
+(0x2600, 0x26FF, 'Miscellaneous_Symbols'),
+(0x2700, 0x27BF, 'Dingbats'),
+(0x27C0, 0x27EF, 'Miscellaneous_Mathematical_Symbols-A'),
+(0x27F0, 0x27FF, 'Supplemental_Arrows-A'),
+(0x2800, 0x28FF, 'Braille_Patterns'),
+(0x2900, 0x297F, 'Supplemental_Arrows-B'),
+(0x2980, 0x29FF, 'Miscellaneous_Mathematical_Symbols-B'),
+(0x2A00, 0x2AFF, 'Supplemental_Mathematical_Operators'),
+(0x2B00, 0x2BFF, 'Miscellaneous_Symbols_and_Arrows'),
+(0x2C00, 0x2C5F, 'Glagolitic'),
+(0x2C60, 0x2C7F, 'Latin_Extended-C'),
+(0x2C80, 0x2CFF, 'Coptic'),
+(0x2D00, 0x2D2F, 'Georgian_Supplement'),
+(0x2D30, 0x2D7F, 'Tifinagh'),
+(0x2D80, 0x2DDF, 'Ethiopic_Extended'),
+(0x2DE0, 0x2DFF, 'Cyrillic_Extended-A'),
+(0x2E00, 0x2E7F, 'Supplemental_Punctuation'),
+(0x2E80, 0x2EFF, 'CJK_Radicals_Supplement'),
+(0x2F00, 0x2FDF, 'Kangxi_Radicals'),
+(0x2FF0, 0x2FFF, 'Ideographic_Description_Characters'),
+(0x3000, 0x303F, 'CJK_Symbols_and_Punctuation'),
+(0x3040, 0x309F, 'Hiragana'),
+(0x30A0, 0x30FF, 'Katakana'),
+(0x3100, 0x312F, 'Bopomofo'),
+(0x3130, 0x318F, 'Hangul_Compatibility_Jamo'),
+(0x3190, 0x319F, 'Kanbun'),
+(0x31A0, 0x31BF, 'Bopomofo_Extended'),
+(0x31C0, 0x31EF, 'CJK_Strokes'),
+(0x31F0, 0x31FF, 'Katakana_Phonetic_Extensions'),
+(0x3200, 0x32FF, 'Enclosed_CJK_Letters_and_Months'),
+(0x3300, 0x33FF, 'CJK_Compatibility'),
+(0x3400, 0x4DBF, 'CJK_Unified_Ideographs_Extension_A'),
+(0x4DC0, 0x4DFF, 'Yijing_Hexagram_Symbols'),
+(0x4E00, 0x9FFF, 'CJK_Unified_Ideographs'),
+(0xA000, 0xA48F, 'Yi_Syllables'),
+(0xA490, 0xA4CF, 'Yi_Radicals'),
+(0xA4D0, 0xA4FF, 'Lisu'),
+(0xA500, 0xA63F, 'Vai'),
+(0xA640, 0xA69F, 'Cyrillic_Extended-B'),
+(0xA6A0, 0xA6FF, 'Bamum'),
+(0xA700, 0xA71F, 'Modifier_Tone_Letters'),
+(0xA720, 0xA7FF, 'Latin_Extended-D'),
+(0xA800, 0xA82F, 'Syloti_Nagri'),
+(0xA830, 0xA83F, 'Common_Indic_Number_Forms'),
+(0xA840, 0xA87F, 'Phags-pa'),
+(0xA880, 0xA8DF, 'Saurashtra'),
+(0xA8E0, 0xA8FF, 'Devanagari_Extended'),
+(0xA900, 0xA92F, 'Kayah_Li'),
+(0xA930, 0xA95F, 'Rejang'),
+(0xA960, 0xA97F, 'Hangul_Jamo_Extended-A'),
+(0xA980, 0xA9DF, 'Javanese'),
+(0xA9E0, 0xA9FF, 'Myanmar_Extended-B'),
+(0xAA00, 0xAA5F, 'Cham'),
+(0xAA60, 0xAA7F, 'Myanmar_Extended-A'),
+(0xAA80, 0xAADF, 'Tai_Viet'),
+(0xAAE0, 0xAAFF, 'Meetei_Mayek_Extensions'),
+(0xAB00, 0xAB2F, 'Ethiopic_Extended-A'),
+(0xAB30, 0xAB6F, 'Latin_Extended-E'),
+(0xAB70, 0xABBF, 'Cherokee_Supplement'),
+(0xABC0, 0xABFF, 'Meetei_Mayek'),
+(0xAC00, 0xD7AF, 'Hangul_Syllables'),
+(0xD7B0, 0xD7FF, 'Hangul_Jamo_Extended-B'),
+(0xD800, 0xDB7F, 'High_Surrogates'),
+(0xDB80, 0xDBFF, 'High_Private_Use_Surrogates'),
+(0xDC00, 0xDFFF, 'Low_Surrogates'),
+(0xE000, 0xF8FF, 'Private_Use_Area'),
+(0xF900, 0xFAFF, 'CJK_Compatibility_Ideographs'),
+(0xFB00, 0xFB4F, 'Alphabetic_Presentation_Forms'),
+(0xFB50, 0xFDFF, 'Arabic_Presentation_Forms-A'),
+(0xFE00, 0xFE0F, 'Variation_Selectors'),
+(0xFE10, 0xFE1F, 'Vertical_Forms'),
+(0xFE20, 0xFE2F, 'Combining_Half_Marks'),
+(0xFE30, 0xFE4F, 'CJK_Compatibility_Forms'),
+(0xFE50, 0xFE6F, 'Small_Form_Variants'),
+(0xFE70, 0xFEFF, 'Arabic_Presentation_Forms-B'),
+(0xFF00, 0xFFEF, 'Halfwidth_and_Fullwidth_Forms'),
+(0xFFF0, 0xFFFF, 'Specials'),
+(0x10000, 0x1007F, 'Linear_B_Syllabary'),
+(0x10080, 0x100FF, 'Linear_B_Ideograms'),
+(0x10100, 0x1013F, 'Aegean_Numbers'),
+(0x10140, 0x1018F, 'Ancient_Greek_Numbers'),
+(0x10190, 0x101CF, 'Ancient_Symbols'),
+(0x101D0, 0x101FF, 'Phaistos_Disc'),
+(0x10280, 0x1029F, 'Lycian'),
+(0x102A0, 0x102DF, 'Carian'),
+(0x102E0, 0x102FF, 'Coptic_Epact_Numbers'),
+(0x10300, 0x1032F, 'Old_Italic'),
+(0x10330, 0x1034F, 'Gothic'),
+(0x10350, 0x1037F, 'Old_Permic'),
+(0x10380, 0x1039F, 'Ugaritic'),
+(0x103A0, 0x103DF, 'Old_Persian'),
+(0x10400, 0x1044F, 'Deseret'),
+(0x10450, 0x1047F, 'Shavian'),
+(0x10480, 0x104AF, 'Osmanya'),
+(0x104B0, 0x104FF, 'Osage'),
+(0x10500, 0x1052F, 'Elbasan'),
+(0x10530, 0x1056F, 'Caucasian_Albanian'),
+(0x10570, 0x105BF, 'Vithkuqi'),
+(0x10600, 0x1077F, 'Linear_A'),
+(0x10780, 0x107BF, 'Latin_Extended-F'),
+(0x10800, 0x1083F, 'Cypriot_Syllabary'),
+(0x10840, 0x1085F, 'Imperial_Aramaic'),
+(0x10860, 0x1087F, 'Palmyrene'),
+(0x10880, 0x108AF, 'Nabataean'),
+(0x108E0, 0x108FF, 'Hatran'),
+(0x10900, 0x1091F, 'Phoenician'),
+(0x10920, 0x1093F, 'Lydian'),
+(0x10980, 0x1099F, 'Meroitic_Hieroglyphs'),
+(0x109A0, 0x109FF, 'Meroitic_Cursive'),
+(0x10A00, 0x10A5F, 'Kharoshthi'),
+(0x10A60, 0x10A7F, 'Old_South_Arabian'),
+(0x10A80, 0x10A9F, 'Old_North_Arabian'),
+(0x10AC0, 0x10AFF, 'Manichaean'),
+(0x10B00, 0x10B3F, 'Avestan'),
+(0x10B40, 0x10B5F, 'Inscriptional_Parthian'),
+(0x10B60, 0x10B7F, 'Inscriptional_Pahlavi'),
+(0x10B80, 0x10BAF, 'Psalter_Pahlavi'),
+(0x10C00, 0x10C4F, 'Old_Turkic'),
+(0x10C80, 0x10CFF, 'Old_Hungarian'),
+(0x10D00, 0x10D3F, 'Hanifi_Rohingya'),
+(0x10E60, 0x10E7F, 'Rumi_Numeral_Symbols'),
+(0x10E80, 0x10EBF, 'Yezidi'),
+(0x10F00, 0x10F2F, 'Old_Sogdian'),
+(0x10F30, 0x10F6F, 'Sogdian'),
+(0x10F70, 0x10FAF, 'Old_Uyghur'),
+(0x10FB0, 0x10FDF, 'Chorasmian'),
+(0x10FE0, 0x10FFF, 'Elymaic'),
+(0x11000, 0x1107F, 'Brahmi'),
+(0x11080, 0x110CF, 'Kaithi'),
+(0x110D0, 0x110FF, 'Sora_Sompeng'),
+(0x11100, 0x1114F, 'Chakma'),
+(0x11150, 0x1117F, 'Mahajani'),
+(0x11180, 0x111DF, 'Sharada'),
+(0x111E0, 0x111FF, 'Sinhala_Archaic_Numbers'),
+(0x11200, 0x1124F, 'Khojki'),
+(0x11280, 0x112AF, 'Multani'),
+(0x112B0, 0x112FF, 'Khudawadi'),
+(0x11300, 0x1137F, 'Grantha'),
+(0x11400, 0x1147F, 'Newa'),
+(0x11480, 0x114DF, 'Tirhuta'),
+(0x11580, 0x115FF, 'Siddham'),
+(0x11600, 0x1165F, 'Modi'),
+(0x11660, 0x1167F, 'Mongolian_Supplement'),
+(0x11680, 0x116CF, 'Takri'),
+(0x11700, 0x1174F, 'Ahom'),
+(0x11800, 0x1184F, 'Dogra'),
+(0x118A0, 0x118FF, 'Warang_Citi'),
+(0x11900, 0x1195F, 'Dives_Akuru'),
+(0x119A0, 0x119FF, 'Nandinagari'),
+(0x11A00, 0x11A4F, 'Zanabazar_Square'),
+(0x11A50, 0x11AAF, 'Soyombo'),
+(0x11AB0, 0x11ABF, 'Unified_Canadian_Aboriginal_Syllabics_Extended-A'),
+(0x11AC0, 0x11AFF, 'Pau_Cin_Hau'),
+(0x11C00, 0x11C6F, 'Bhaiksuki'),
+(0x11C70, 0x11CBF, 'Marchen'),
+(0x11D00, 0x11D5F, 'Masaram_Gondi'),
+(0x11D60, 0x11DAF, 'Gunjala_Gondi'),
+(0x11EE0, 0x11EFF, 'Makasar'),
+(0x11FB0, 0x11FBF, 'Lisu_Supplement'),
+(0x11FC0, 0x11FFF, 'Tamil_Supplement'),
+(0x12000, 0x123FF, 'Cuneiform'),
+(0x12400, 0x1247F, 'Cuneiform_Numbers_and_Punctuation'),
+(0x12480, 0x1254F, 'Early_Dynastic_Cuneiform'),
+(0x12F90, 0x12FFF, 'Cypro-Minoan'),
+(0x13000, 0x1342F, 'Egyptian_Hieroglyphs'),
+(0x13430, 0x1343F, 'Egyptian_Hieroglyph_Format_Controls'),
+(0x14400, 0x1467F, 'Anatolian_Hieroglyphs'),
+(0x16800, 0x16A3F, 'Bamum_Supplement'),
+(0x16A40, 0x16A6F, 'Mro'),
+(0x16A70, 0x16ACF, 'Tangsa'),
+(0x16AD0, 0x16AFF, 'Bassa_Vah'),
+(0x16B00, 0x16B8F, 'Pahawh_Hmong'),
+(0x16E40, 0x16E9F, 'Medefaidrin'),
+(0x16F00, 0x16F9F, 'Miao'),
+(0x16FE0, 0x16FFF, 'Ideographic_Symbols_and_Punctuation'),
+(0x17000, 0x187FF, 'Tangut'),
+(0x18800, 0x18AFF, 'Tangut_Components'),
+(0x18B00, 0x18CFF, 'Khitan_Small_Script'),
+(0x18D00, 0x18D7F, 'Tangut_Supplement'),
+(0x1AFF0, 0x1AFFF, 'Kana_Extended-B'),
+(0x1B000, 0x1B0FF, 'Kana_Supplement'),
+(0x1B100, 0x1B12F, 'Kana_Extended-A'),
+(0x1B130, 0x1B16F, 'Small_Kana_Extension'),
+(0x1B170, 0x1B2FF, 'Nushu'),
+(0x1BC00, 0x1BC9F, 'Duployan'),
+(0x1BCA0, 0x1BCAF, 'Shorthand_Format_Controls'),
+(0x1CF00, 0x1CFCF, 'Znamenny_Musical_Notation'),
+(0x1D000, 0x1D0FF, 'Byzantine_Musical_Symbols'),
+(0x1D100, 0x1D1FF, 'Musical_Symbols'),
+(0x1D200, 0x1D24F, 'Ancient_Greek_Musical_Notation'),
+(0x1D2E0, 0x1D2FF, 'Mayan_Numerals'),
+(0x1D300, 0x1D35F, 'Tai_Xuan_Jing_Symbols'),
+(0x1D360, 0x1D37F, 'Counting_Rod_Numerals'),
+(0x1D400, 0x1D7FF, 'Mathematical_Alphanumeric_Symbols'),
+(0x1D800, 0x1DAAF, 'Sutton_SignWriting'),
+(0x1DF00, 0x1DFFF, 'Latin_Extended-G'),
+(0x1E000, 0x1E02F, 'Glagolitic_Supplement'),
+(0x1E100, 0x1E14F, 'Nyiakeng_Puachue_Hmong'),
+(0x1E290, 0x1E2BF, 'Toto'),
+(0x1E2C0, 0x1E2FF, 'Wancho'),
+(0x1E7E0, 0x1E7FF, 'Ethiopic_Extended-B'),
+(0x1E800, 0x1E8DF, 'Mende_Kikakui'),
+(0x1E900, 0x1E95F, 'Adlam'),
+(0x1EC70, 0x1ECBF, 'Indic_Siyaq_Numbers'),
+(0x1ED00, 0x1ED4F, 'Ottoman_Siyaq_Numbers'),
+(0x1EE00, 0x1EEFF, 'Arabic_Mathematical_Alphabetic_Symbols'),
+(0x1F000, 0x1F02F, 'Mahjong_Tiles'),
+(0x1F030, 0x1F09F, 'Domino_Tiles'),
+(0x1F0A0, 0x1F0FF, 'Playing_Cards'),
+(0x1F100, 0x1F1FF, 'Enclosed_Alphanumeric_Supplement'),
+(0x1F200, 0x1F2FF, 'Enclosed_Ideographic_Supplement'),
+(0x1F300, 0x1F5FF, 'Miscellaneous_Symbols_and_Pictographs'),
+(0x1F600, 0x1F64F, 'Emoticons'),
+(0x1F650, 0x1F67F, 'Ornamental_Dingbats'),
+(0x1F680, 0x1F6FF, 'Transport_and_Map_Symbols'),
+(0x1F700, 0x1F77F, 'Alchemical_Symbols'),
+(0x1F780, 0x1F7FF, 'Geometric_Shapes_Extended'),
+(0x1F800, 0x1F8FF, 'Supplemental_Arrows-C'),
+(0x1F900, 0x1F9FF, 'Supplemental_Symbols_and_Pictographs'),
+(0x1FA00, 0x1FA6F, 'Chess_Symbols'),
+(0x1FA70, 0x1FAFF, 'Symbols_and_Pictographs_Extended-A'),
+(0x1FB00, 0x1FBFF, 'Symbols_for_Legacy_Computing'),
+(0x20000, 0x2A6DF, 'CJK_Unified_Ideographs_Extension_B'),
+(0x2A700, 0x2B73F, 'CJK_Unified_Ideographs_Extension_C'),
+(0x2B740, 0x2B81F, 'CJK_Unified_Ideographs_Extension_D'),
+(0x2B820, 0x2CEAF, 'CJK_Unified_Ideographs_Extension_E'),
+(0x2CEB0, 0x2EBEF, 'CJK_Unified_Ideographs_Extension_F'),
+(0x2F800, 0x2FA1F, 'CJK_Compatibility_Ideographs_Supplement'),
+(0x30000, 0x3134F, 'CJK_Unified_Ideographs_Extension_G'),
+(0xE0000, 0xE007F, 'Tags'),
+(0xE0100, 0xE01EF, 'Variation_Selectors_Supplement'),
+(0xF0000, 0xFFFFF, 'Supplementary_Private_Use_Area-A'),
+(0x100000, 0x10FFFF, 'Supplementary_Private_Use_Area-B'),
+)
+
+starts = array('I', [x[0] for x in blocks])
+ends = array('I', [x[1] for x in blocks])
+names = tuple([x[2] for x in blocks])
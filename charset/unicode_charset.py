@@ -2,9 +2,39 @@
 # -*- encoding:utf-8 -*-
 
 import struct
+from bisect import bisect_right
+from types import MappingProxyType
 
 from .base import CharsetBase
+from .index import IntervalIndex
 from . import unicode_category
+from . import unicode_blocks
+
+
+def build_category():
+    # built once on import and shared read-only by all instances. Blocks of
+    # Blocks.txt missed by unicode_category are added with English names.
+    category = {}
+    for p in range(17):
+        items = [{
+            'name': c[2],
+            'range': c[0],
+            'desc': c[1],
+        } for c in getattr(unicode_category, 'panel%s' % p, ())]
+        for start, end, name in unicode_blocks.blocks:
+            if start >> 16 != p:
+                continue
+            if any(start <= c['range'][1] and c['range'][0] <= end for c in items):
+                continue
+            items.append({
+                'name': name,
+                'range': (start, end),
+                'desc': name.replace('_', ' '),
+            })
+        if items:
+            items.sort(key=lambda x: x['range'][0])
+            category['panel%s' % p] = tuple([MappingProxyType(x) for x in items])
+    return MappingProxyType(category)
 
 
 class Unicode(CharsetBase):
@@ -20,8 +50,11 @@ class Unicode(CharsetBase):
         u'目前的Unicode字元分為17組編排，每組稱為平面（Plane），而每平面擁有65536（即2 ** 16）個代碼點。然而目前只用了少數平面。',
     ]
     wiki = 'https://zh.wikipedia.org/wiki/Unicode'
+    category = build_category()
 
     encoding = 'utf-32-be'
+    page_rows = 16
+    slice_rows = 16
     define = {
         'panel0': {
             'desc': [u'基本多文種平面', 'Basic Multilingual Plane (BMP)'],
@@ -53,63 +86,86 @@ class Unicode(CharsetBase):
         },
     }
 
-    def __init__(self, errors=None):
-        super(Unicode, self).__init__(errors=errors)
-        for p in unicode_category.panels:
-            category = []
-            for c in getattr(unicode_category, 'panel%s' % p):
-                category.append({
-                    'name': c[2],
-                    'range': c[0],
-                    'desc': c[1],
-                })
-            self.category['panel%s' % p] = category
-
-    def codes(self, chars):
-        codes = super(Unicode, self).codes(chars)
-        return ['U+' + code for code in codes]
+    def format_code(self, b_code):
+        return 'U+' + super(Unicode, self).format_code(b_code)
+
+    @classmethod
+    def build_category_index(cls):
+        return IntervalIndex(cls.category)
+
+    def code_ranges(self, rng):
+        m, n = rng
+        panel = m >> 16 & 0xff
+        return [(0, 0), (panel, panel), (m >> 8 & 0xff, n >> 8 & 0xff), (m & 0xff, n & 0xff)]
+
+    @staticmethod
+    def block_of(cp):
+        # block name of Blocks.txt for code point, None for No_Block
+        x = bisect_right(unicode_blocks.starts, cp) - 1
+        if x >= 0 and cp <= unicode_blocks.ends[x]:
+            return unicode_blocks.names[x]
+        return None
+
+    def category_ids(self, codes, names):
+        # intervals of the category first, then blocks, searched for all
+        # code points at once
+        import numpy as np
+        points = codes[:, 1].astype(np.int64) << 16 | codes[:, 2].astype(np.int64) << 8 | codes[:, 3]
+        ids = np.full(len(codes), -1, np.int16)
+        index = self.category_index()
+        for starts, ends, found in (
+                (index.starts, index.ends, index.names),
+                (unicode_blocks.starts, unicode_blocks.ends, unicode_blocks.names)):
+            starts = np.array(starts, np.int64)
+            x = np.searchsorted(starts, points, side='right') - 1
+            hit = (x >= 0) & (points <= np.array(ends, np.int64)[np.maximum(x, 0)]) & (ids < 0)
+            for name in found:
+                if name not in names:
+                    names.append(name)
+            lookup = np.array([names.index(name) for name in found], np.int16)
+            ids[hit] = lookup[x[hit]]
+        return ids
+
+    def panel_slices(self, define):
+        # slice_rows high bytes of the one table of a plane, the first slice
+        # opens the table and the last one closes it. A slice of a slice
+        # keeps its place in the table.
+        m, n = define['range']
+        head = define.get('head', True)
+        tail = define.get('tail', True)
+        return [
+            dict(define, range=(x, min(x + (self.slice_rows << 8) - 1, n)),
+                 head=head and x == m, tail=tail and x + (self.slice_rows << 8) > n)
+            for x in range(m, n + 1, self.slice_rows << 8)
+        ]
+
+    def panel_pages(self, define):
+        # a page of page_rows high bytes
+        m, n = define['range']
+        return [
+            dict(define, range=(x, min(x + (self.page_rows << 8) - 1, n)))
+            for x in range(m, n + 1, self.page_rows << 8)
+        ]
+
+    def page_label(self, define):
+        return 'U+%04X - U+%04X' % define['range']
 
     def get_category(self, b_code):
         code, = struct.unpack('>L', b_code)
-        panel = code >> 16 & 0xff
-        category = self.category.get('panel%s' % panel)
-        if category:
-            for c in category:
-                if c['range'][0] <= code <= c['range'][1]:
-                    return c['name']
-        return None
+        return self.category_index().lookup(code) or self.block_of(code)
 
-    def do_panel_as_html(self, define, err_ch):
-        html = []
+    def do_panel_as_html(self, define, err_ch, collapse=False):
+        cells = self.code_table(define).cells(err_ch)
         m, n = define['range']
-        panel = m >> 16 & 0xff
         x1 = m >> 8 & 0xff
         x2 = n >> 8 & 0xff
         y1 = m & 0xff
         y2 = n & 0xff
-        html.append('<table>')
-        html.append(
-            '<tr>' +
-            '<td></td>' +
-            ''.join(['<td>%02X</td>' % y for y in range(y1, y2 + 1)]) +
-            '</tr>'
-        )
-        for x in range(x1, x2 + 1):
-            row = []
-            row.append('<td>%02X</td>' % x)
-            for y in range(y1, y2 + 1):
-                b_code = struct.pack('>4B', 0, int(panel), x, y)
-                ch = b_code.decode(self.encoding, errors='ignore')
-                if not ch:
-                    ch = err_ch
-                name = self.get_category(b_code)
-                if name:
-                    row.append('<td class="%s">%s</td>' % (name, ch))
-                else:
-                    row.append('<td>%s</td>' % ch)
-            html.append('<tr>' + ''.join(row) + '</tr>')
-        html.append('</table>')
-        return html
+        header = [self.header_row(['%02X' % y for y in range(y1, y2 + 1)])]
+        labels = ['<td>%02X</td>' % x for x in range(x1, x2 + 1)]
+        return self.table_as_html(
+            cells, header, labels, y2 - y1 + 1, collapse=collapse,
+            head=define.get('head', True), tail=define.get('tail', True))
 
 
 if __name__ == '__main__':
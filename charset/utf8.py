@@ -1,8 +1,6 @@
 #!/usr/bin/env python
 # -*- encoding:utf-8 -*-
 
-import struct
-
 from .base import CharsetBase
 
 
@@ -61,149 +59,80 @@ class UTF8(CharsetBase):
         ],
     }
 
-    def __init__(self, errors=None):
-        super(UTF8, self).__init__(errors=errors)
-
-    def get_category(self, b_code):
-        code, = struct.unpack('>L', b_code)
-        f = code >> 24 & 0xff
-        s = code >> 16 & 0xff
-        t = code >> 8 & 0xff
-        fo = code & 0xff
-        for k, v in self.category.items():
-            for vv in v:
-                for f1, f2, s1, s2, t1, t2, fo1, fo2 in vv['range']:
-                    if f1 <= f <= f2 and s1 <= s <= s2 and t1 <= t <= t2 and fo1 <= fo <= fo2:
-                        return vv['name']
-        return None
+    def __init__(self, errors=None, cache=None):
+        super(UTF8, self).__init__(errors=errors, cache=cache)
 
-    def do_panel_as_html(self, define, err_ch):
+    def do_panel_as_html(self, define, err_ch, collapse=False):
         f1, f2, s1, s2, t1, t2, fo1, fo2 = define['range']
         if f1 == f2 == s1 == s2 == t1 == t2 == 0x0:
-            return self.panel_as_html_1B(define, err_ch)
+            return self.panel_as_html_1B(define, err_ch, collapse)
         elif f1 == f2 == s1 == s2 == 0x0:
-            return self.panel_as_html_2B(define, err_ch)
+            return self.panel_as_html_2B(define, err_ch, collapse)
         elif f1 == f2 == 0x0:
-            return self.panel_as_html_3B(define, err_ch)
+            return self.panel_as_html_3B(define, err_ch, collapse)
         else:
-            return self.panel_as_html_4B(define, err_ch)
+            return self.panel_as_html_4B(define, err_ch, collapse)
         return []
 
-    def panel_as_html_1B(self, define, err_ch):
-        html = []
+    def panel_slices(self, define):
+        f1, f2, s1, s2, t1, t2, fo1, fo2 = define['range']
+        if f1 == f2 == s1 == s2 == 0x0:
+            return [define]
+        # one table per first byte
+        if f1 == f2 == 0x0:
+            return [dict(define, range=(f1, f2, s, s) + define['range'][4:]) for s in range(s1, s2 + 1)]
+        return [dict(define, range=(f, f) + define['range'][2:]) for f in range(f1, f2 + 1)]
+
+    def panel_pages(self, define):
+        f1, f2, s1, s2, t1, t2, fo1, fo2 = define['range']
+        if f1 == f2 == 0x0:
+            return self.panel_slices(define)
+        # one page per first and second byte
+        return [
+            dict(define, range=(f, f, s, s) + define['range'][4:])
+            for f in range(f1, f2 + 1) for s in range(s1, s2 + 1)
+        ]
+
+    def panel_as_html_1B(self, define, err_ch, collapse=False):
+        cells = self.code_table(define).cells(err_ch)
         m1, m2, n1, n2, x1, x2, y1, y2 = define['range']
         x1, x2 = (y1 >> 4 & 0xf, y2 >> 4 & 0xf)
         y1, y2 = (y1 & 0xf, y2 & 0xf)
-        html.append('<table>')
-        html.append(
-            '<tr>' +
-            '<td></td>' +
-            ''.join(['<td>%02X</td>' % y for y in range(y1, y2 + 1)]) +
-            '</tr>'
-        )
-        for x in range(x1, x2 + 1):
-            row = []
-            row.append('<td>%02X</td>' % x)
-            for y in range(y1, y2 + 1):
-                b_code = struct.pack('>B', x << 4 | y)
-                ch = b_code.decode(self.encoding, errors='ignore')
-                if not ch:
-                    ch = err_ch
-                name = self.get_category(b'\x00\x00\x00' + b_code)
-                if name:
-                    row.append('<td class="%s">%s</td>' % (name, ch))
-                else:
-                    row.append('<td>%s</td>' % ch)
-            html.append('<tr>' + ''.join(row) + '</tr>')
-        html.append('</table>')
-        return html
+        header = [self.header_row(['%02X' % y for y in range(y1, y2 + 1)])]
+        labels = ['<td>%02X</td>' % x for x in range(x1, x2 + 1)]
+        return self.table_as_html(cells, header, labels, y2 - y1 + 1, b'\x00\x00\x00', collapse=collapse)
 
-    def panel_as_html_2B(self, define, err_ch):
+    def panel_as_html_2B(self, define, err_ch, collapse=False):
+        cells = self.code_table(define).cells(err_ch)
         # two
-        html = []
         m1, m2, n1, n2, x1, x2, y1, y2 = define['range']
-        html.append('<table>')
-        html.append(
-            '<tr>' +
-            '<td></td>' +
-            ''.join(['<td>%02X</td>' % y for y in range(y1, y2 + 1)]) +
-            '</tr>'
-        )
-        for x in range(x1, x2 + 1):
-            row = []
-            row.append('<td>%02X</td>' % x)
-            for y in range(y1, y2 + 1):
-                b_code = struct.pack('>2B', x, y)
-                ch = b_code.decode(self.encoding, errors='ignore')
-                if not ch:
-                    ch = err_ch
-                name = self.get_category(b'\x00\x00' + b_code)
-                if name:
-                    row.append('<td class="%s">%s</td>' % (name, ch))
-                else:
-                    row.append('<td>%s</td>' % ch)
-            html.append('<tr>' + ''.join(row) + '</tr>')
-        html.append('</table>')
-        return html
+        header = [self.header_row(['%02X' % y for y in range(y1, y2 + 1)])]
+        labels = ['<td>%02X</td>' % x for x in range(x1, x2 + 1)]
+        return self.table_as_html(cells, header, labels, y2 - y1 + 1, b'\x00\x00', collapse=collapse)
 
-    def panel_as_html_3B(self, define, err_ch):
-        html = []
+    def panel_as_html_3B(self, define, err_ch, collapse=False):
+        cells = self.code_table(define).cells(err_ch)
         m1, m2, x1, x2, y1, y2, z1, z2 = define['range']
+        # every table has the same header and row labels
+        header = [self.header_row(['%02X' % z for z in range(z1, z2 + 1)])]
+        labels = ['<td>%02X</td>' % y for y in range(y1, y2 + 1)]
         for x in range(x1, x2 + 1):
-            html.append('<h4>%02X table</h4>' % x)
-            html.append('<table>')
-            html.append(
-                '<tr>' +
-                '<td></td>' +
-                ''.join(['<td>%02X</td>' % z for z in range(z1, z2 + 1)]) +
-                '</tr>'
-            )
-            for y in range(y1, y2 + 1):
-                row = []
-                row.append('<td>%02X</td>' % y)
-                for z in range(z1, z2 + 1):
-                    b_code = struct.pack('>3B', x, y, z)
-                    ch = b_code.decode(self.encoding, errors='ignore')
-                    if not ch:
-                        ch = err_ch
-                    name = self.get_category(b'\x00' + b_code)
-                    if name:
-                        row.append('<td class="%s">%s</td>' % (name, ch))
-                    else:
-                        row.append('<td>%s</td>' % ch)
-                html.append('<tr>' + ''.join(row) + '</tr>')
-            html.append('</table>')
-        return html
+            for line in self.table_as_html(
+                    cells, header, labels, z2 - z1 + 1, b'\x00',
+                    title='<h4>%02X table</h4>' % x, collapse=collapse):
+                yield line
 
-    def panel_as_html_4B(self, define, err_ch):
-        html = []
+    def panel_as_html_4B(self, define, err_ch, collapse=False):
+        cells = self.code_table(define).cells(err_ch)
         a1, a2, x1, x2, y1, y2, z1, z2 = define['range']
+        header = [self.header_row(['%02X' % z for z in range(z1, z2 + 1)])]
+        labels = ['<td>%02X</td>' % y for y in range(y1, y2 + 1)]
         for a in range(a1, a2 + 1):
             for x in range(x1, x2 + 1):
-                html.append('<h4>%02X %02X table</h4>' % (a, x))
-                html.append('<table>')
-                html.append(
-                    '<tr>' +
-                    '<td></td>' +
-                    ''.join(['<td>%02X</td>' % z for z in range(z1, z2 + 1)]) +
-                    '</tr>'
-                )
-                for y in range(y1, y2 + 1):
-                    row = []
-                    row.append('<td>%02X</td>' % y)
-                    for z in range(z1, z2 + 1):
-                        b_code = struct.pack('>4B', a, x, y, z)
-                        ch = b_code.decode(self.encoding, errors='ignore')
-                        if not ch:
-                            ch = err_ch
-                        name = self.get_category(b_code)
-                        if name:
-                            row.append('<td class="%s">%s</td>' % (name, ch))
-                        else:
-                            row.append('<td>%s</td>' % ch)
-                    html.append('<tr>' + ''.join(row) + '</tr>')
-                html.append('</table>')
-        return html
+                for line in self.table_as_html(
+                        cells, header, labels, z2 - z1 + 1,
+                        title='<h4>%02X %02X table</h4>' % (a, x), collapse=collapse):
+                    yield line
 
 
 if __name__ == '__main__':
@@ -1,17 +1,108 @@
 # encoding: utf-8
 
-import webcolors
+import io
+import zlib
+from functools import lru_cache
+from contextlib import contextmanager
 
+# hue step of generated colours, neighbours are far apart on the wheel
+GOLDEN_ANGLE = 137.508
+
+
+def named_colors():
+    # webcolors is only needed to colour HTML panels
+    import webcolors
 
-def get_colors(step):
     o_colors = [k for k, v in webcolors.css3_names_to_hex.items() if k not in ['black', 'white']]
     o_colors.sort()
+    return o_colors
+
+
+def hsl_colors(step):
+    # light backgrounds, the lightness alternates so that close hues differ
+    return tuple(
+        'hsl(%d,70%%,%d%%)' % (x * GOLDEN_ANGLE % 360, (78, 86, 70)[x % 3])
+        for x in range(step)
+    )
+
+
+@lru_cache(maxsize=None)
+def get_colors(step):
+    # colour of each of step categories, named colours spread over the
+    # sorted css3 names or generated ones when there are not enough names
+    if step <= 0:
+        return ()
+    o_colors = named_colors()
     colors_max = len(o_colors)
-    miss = step - colors_max
-    colors = []
-    if miss > 0:
-        colors = o_colors
-        colors += o_colors[:miss]
+    if step > colors_max:
+        return hsl_colors(step)
+    return tuple(o_colors[x] for x in range(0, colors_max, colors_max // step))
+
+
+# compression of output files by file name suffix
+COMPRESS_SUFFIX = {
+    'gzip': '.gz',
+    'zlib': '.zz',
+    'xz': '.xz',
+}
+
+COMPRESS_LEVEL = 6
+
+
+def compress_of(filename):
+    for compress, suffix in COMPRESS_SUFFIX.items():
+        if filename.endswith(suffix):
+            return compress
+    return None
+
+
+class ZlibWriter(io.RawIOBase):
+    # zlib stream of the data written to fileobj, fileobj is left open
+    def __init__(self, fileobj, level=COMPRESS_LEVEL):
+        self.fileobj = fileobj
+        self.compressor = zlib.compressobj(level)
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.fileobj.write(self.compressor.compress(data))
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self.fileobj.write(self.compressor.flush())
+        io.RawIOBase.close(self)
+
+
+def compressed_text(fileobj, compress):
+    # text stream compressed as it is written to the binary fileobj,
+    # closing it ends the compressed data and leaves fileobj open
+    if compress == 'gzip':
+        import gzip
+        writer = gzip.GzipFile(fileobj=fileobj, mode='wb', compresslevel=COMPRESS_LEVEL)
+    elif compress == 'xz':
+        import lzma
+        writer = lzma.LZMAFile(fileobj, 'wb', preset=COMPRESS_LEVEL)
+    elif compress == 'zlib':
+        writer = io.BufferedWriter(ZlibWriter(fileobj), 1 << 16)
     else:
-        colors = [o_colors[x] for x in range(0, colors_max, int(colors_max / step))]
-    return colors
+        raise ValueError('unknown compression: %s' % compress)
+    return io.TextIOWrapper(writer, encoding='utf-8')
+
+
+@contextmanager
+def open_output(filename, compress=None):
+    # text file of filename, compressed by compress or by the suffix of
+    # filename
+    compress = compress or compress_of(filename)
+    if not compress:
+        with io.open(filename, 'w', encoding='utf-8') as f:
+            yield f
+        return
+    with open(filename, 'wb') as f:
+        text = compressed_text(f, compress)
+        try:
+            yield text
+        finally:
+            text.close()
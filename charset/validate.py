@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- encoding:utf-8 -*-
+
+import os
+import re
+import mmap
+import codecs
+import threading
+from collections import Counter, OrderedDict
+
+from charset import CHARSET_CLASS
+
+
+CHUNK_SIZE = 1 << 23
+
+# a byte of 0x00-0x2F is never a trail byte of GBK, GB18030 or UTF-8, a
+# sequence always starts after it
+SYNC_BYTE = re.compile(b'[\x00-\x2f]')
+
+
+class ErrorLog(object):
+    # invalid sequences found by the codec, offsets are of the file
+    def __init__(self, offset, max_errors):
+        self.offset = offset
+        self.max_errors = max_errors
+        self.errors = []
+        self.count = 0
+
+    def add(self, err):
+        self.count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((self.offset + err.start, err.object[err.start:err.end]))
+
+
+current = threading.local()
+
+
+def log_error(err):
+    # error handler of the codec, the invalid sequence is skipped
+    current.log.add(err)
+    return u'', err.end
+
+
+codecs.register_error('charset-validate', log_error)
+
+
+def open_map(path):
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return None, 0
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), size
+
+
+def chunk_bounds(mm, size, encoding, chunk_size=CHUNK_SIZE):
+    # chunks start where a sequence starts, so each one is checked alone
+    bounds = []
+    start = 0
+    while start < size:
+        stop = start + chunk_size
+        if stop >= size:
+            stop = size
+        elif encoding.startswith('utf-32'):
+            stop -= stop % 4
+        else:
+            m = SYNC_BYTE.search(mm, stop)
+            stop = m.end() if m else size
+        bounds.append((start, stop))
+        start = stop
+    return bounds
+
+
+def scan_chunk(path, encoding, start, stop, max_errors):
+    # (invalid sequences as (offset, bytes), count of them, char counter),
+    # the chunk is decoded in one codec call
+    mm, size = open_map(path)
+    log = current.log = ErrorLog(start, max_errors)
+    try:
+        with memoryview(mm) as view:
+            text = str(view[start:stop], encoding, 'charset-validate')
+    finally:
+        current.log = None
+        mm.close()
+    return log.errors, log.count, Counter(text)
+
+
+def validate(path, encoding, jobs=None, chunk_size=CHUNK_SIZE, max_errors=100):
+    charset = CHARSET_CLASS[encoding]()
+    mm, size = open_map(path)
+    bounds = []
+    if mm is not None:
+        bounds = chunk_bounds(mm, size, charset.encoding, chunk_size)
+        mm.close()
+    errors = []
+    count = 0
+    chars = Counter()
+    if jobs and jobs > 1 and len(bounds) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(jobs) as executor:
+            futures = [
+                executor.submit(scan_chunk, path, charset.encoding, start, stop, max_errors)
+                for start, stop in bounds
+            ]
+            parts = (future.result() for future in futures)
+            for part_errors, part_count, part_chars in parts:
+                errors += part_errors
+                count += part_count
+                chars.update(part_chars)
+    else:
+        for start, stop in bounds:
+            part_errors, part_count, part_chars = scan_chunk(
+                path, charset.encoding, start, stop, max_errors)
+            errors += part_errors
+            count += part_count
+            chars.update(part_chars)
+    categories = Counter()
+    for ch, n in chars.items():
+        try:
+            category = charset.char_category(ch)
+        except UnicodeEncodeError:
+            category = None
+        categories[category or '-'] += n
+    return OrderedDict((
+        ('size', size),
+        ('chunks', len(bounds)),
+        ('chars', sum(chars.values())),
+        ('invalid', count),
+        ('errors', errors[:max_errors]),
+        ('categories', OrderedDict(categories.most_common())),
+    ))
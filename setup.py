@@ -17,6 +17,9 @@ setup(
     packages=[
         'charset',
     ],
+    package_data={
+        'charset': ['data/*.txt'],
+    },
     entry_points={
         'console_scripts': [
             'charset = charset.__main__:main',
@@ -1,7 +1,7 @@
 #!/bin/bash
 
 
-charset="python charset.py"
+charset="python -m charset"
 
 char_search2()
 {
@@ -38,6 +38,8 @@ char_search()
 
     $charset --encoding unicode --code 我们
     $charset --encoding unicode --char 6211,4EEC
+
+    $charset --all --code 我们
 }
 
 char_gen()
@@ -62,6 +64,48 @@ char_gen()
     $charset --encoding unicode --panel 16  uni-16.html
 }
 
+char_build()
+{
+    $charset build --jobs 4 build.txt
+}
+
+char_pages()
+{
+    $charset --encoding gb18030 --panel 2 --pages gb18030-2
+    $charset --encoding utf8 --panel 3 --pages utf-3
+    $charset --encoding unicode --panel 0,1,2,3,14,15,16 --pages uni
+}
+
+char_coverage()
+{
+    $charset coverage --encoding gb2312 --encoding gbk --encoding gb18030 $COVERAGE_FILES
+}
+
+char_validate()
+{
+    $charset validate --encoding gb18030 --jobs 4 $VALIDATE_FILE
+}
+
+char_bench()
+{
+    python -m charset.bench --json bench.json $BENCH_ARGS
+}
+
+char_bench_compress()
+{
+    python -m charset.bench --compress $BENCH_ARGS
+}
+
+char_startup()
+{
+    python -m charset.bench --startup
+}
+
+char_serve()
+{
+    python -m charset serve $SERVE_ARGS
+}
+
 char_$1
 
 # vim: tabstop=4 shiftwidth=4 expandtab